@@ -1,5 +1,9 @@
 import math
 
+import numpy
+
+from . import vector_activations
+
 
 def linear(x):
     """Linear activation function
@@ -108,3 +112,140 @@ def tanh(x):
         float: output value
     """
     return 2 * sigmoid(2 * x) - 1
+
+
+ACTIVATIONS = {}
+_names = {}
+
+
+def register_activation(name, scalar, vector=None):
+    """Registers an activation function by name with its scalar and numpy forms
+
+    Args:
+        name (str): Name of the activation function
+        scalar (Callable[[float], float]): The scalar form, used by Brain.predict
+        vector (Callable[[numpy.ndarray], numpy.ndarray], optional): The numpy form, used by the batched engine. Defaults to numpy.vectorize of the scalar form.
+    """
+    ACTIVATIONS[name] = (scalar, vector)
+    _names[scalar] = name
+
+
+def get_activation(func, vectorized=False):
+    """Resolves an activation function to the form used by an evaluation engine
+
+    Args:
+        func (str or Callable): Name or scalar form of the activation function. An unregistered function is taken as is,
+            with its vector attribute as numpy form if it has one
+        vectorized (bool, optional): Returns the numpy form instead of the scalar form. Defaults to False.
+
+    Returns:
+        Callable: The activation function
+    """
+    name = func if isinstance(func, str) else _names.get(func)
+
+    if name is None:
+        scalar, vector = func, getattr(func, 'vector', None)
+    else:
+        scalar, vector = ACTIVATIONS[name]
+
+    if not vectorized:
+        return scalar
+
+    if vector is None:
+        vector = numpy.vectorize(scalar, otypes=[float])
+
+        if name is not None:
+            ACTIVATIONS[name] = (scalar, vector)
+
+    return vector
+
+
+for _scalar in [linear, sigmoid, clamped, relu, lelu, softplus, step, tanh]:
+    register_activation(_scalar.__name__, _scalar, getattr(vector_activations, _scalar.__name__))
+
+
+class ApproximateActivation:
+    def __init__(self, func, size=2048, limit=10):
+        """Activation function read from a precomputed table with linear interpolation
+
+        Kept opt-in: the interpolation costs more than math.exp per scalar call and more than
+        numpy's exp over arrays, benchmarks/activations.py measures both modes.
+
+        The table samples the function at size + 1 evenly spaced points over [-limit, limit].
+        Outside of that range the output is clamped to the value at the border.
+
+        Args:
+            func (Callable[[float], float]): The exact activation function, registered with a numpy form
+            size (int, optional): Number of intervals of the table. Defaults to 2048.
+            limit (float, optional): Half width of the range covered by the table. Defaults to 10.
+
+        Contains:
+            func (Callable[[float], float]): The exact activation function
+            values (List[float]): The sampled values
+            table (numpy.ndarray): The sampled values, for the numpy form
+            slopes (numpy.ndarray): Difference to the next sampled value, 0 after the last one
+            max_error (float): Largest difference to the exact function, measured on a dense grid
+        """
+        self.func = func
+        self.size = size
+        self.low = -limit
+        self.scale = size / (2 * limit)
+
+        self.table = get_activation(func, vectorized=True)(numpy.linspace(-limit, limit, size + 1))
+        self.slopes = numpy.append(numpy.diff(self.table), 0)
+        self.values = self.table.tolist()
+        self.__name__ = f'approximate_{getattr(func, "__name__", "activation")}'
+
+        grid = numpy.concatenate([numpy.linspace(-2 * limit, 2 * limit, 16 * size + 1), [-1e3, 1e3]])
+        self.max_error = float(numpy.abs(self.vector(grid) - get_activation(func, vectorized=True)(grid)).max())
+
+    def __call__(self, x):
+        t = (x - self.low) * self.scale
+
+        if t <= 0:
+            return self.values[0]
+        if t >= self.size:
+            return self.values[-1]
+
+        i = int(t)
+        value = self.values[i]
+
+        return value + (self.values[i + 1] - value) * (t - i)
+
+    def vector(self, x):
+        """Numpy form of the approximate activation function
+
+        Args:
+            x (numpy.ndarray): input values
+
+        Returns:
+            numpy.ndarray: output values
+        """
+        t = numpy.asarray(x, dtype=float) - self.low
+        t *= self.scale
+        numpy.clip(t, 0, self.size, out=t)
+
+        i = t.astype(numpy.intp)
+        t -= i
+
+        values = self.table.take(i)
+        values += self.slopes.take(i) * t
+
+        return values
+
+
+def approximate(func, size=2048, limit=10):
+    """Returns the lookup table form of sigmoid and tanh, other activation functions are returned unchanged
+
+    Args:
+        func (Callable[[float], float]): The activation function
+        size (int, optional): Number of intervals of the table. Defaults to 2048.
+        limit (float, optional): Half width of the range covered by the table. Defaults to 10.
+
+    Returns:
+        Callable[[float], float]: The activation function to use
+    """
+    if func in (sigmoid, tanh):
+        return ApproximateActivation(func, size, limit)
+
+    return func
@@ -0,0 +1,194 @@
+"""
+Columnar archive of many genomes in one memory mapped file.
+
+Layout, all sections 8 byte aligned:
+    header       HEADER_DTYPE, magic, version and the offset and length of every section
+    nodes        NODE_DTYPE rows of all the genomes, one after the other
+    connections  CONN_DTYPE rows of all the genomes, one after the other
+    index        INDEX_DTYPE, one row per genome with its ID, fitness and the slices of its rows
+
+Convert saved brains from the src directory:
+    python -m algorithm.archive cells.arc cell-*.json
+"""
+import argparse
+import glob
+
+import numpy
+
+from .brain import Brain
+from .genome import ArrayBrain, NodeTable, ConnectionTable, NODE_DTYPE, CONN_DTYPE
+from .save import load_brain
+
+ARCHIVE_MAGIC = b'NEATARCH'
+ARCHIVE_VERSION = 1
+
+HEADER_DTYPE = numpy.dtype([
+    ('magic', 'S8'),
+    ('version', numpy.uint32),
+    ('count', numpy.uint32),
+    ('nodes', numpy.uint64),
+    ('num_nodes', numpy.uint64),
+    ('connections', numpy.uint64),
+    ('num_connections', numpy.uint64),
+    ('index', numpy.uint64)
+])
+
+INDEX_DTYPE = numpy.dtype([
+    ('id', numpy.int64),
+    ('fitness', numpy.float64),
+    ('node_start', numpy.uint64),
+    ('node_count', numpy.uint64),
+    ('connection_start', numpy.uint64),
+    ('connection_count', numpy.uint64)
+])
+
+
+def _aligned(offset):
+    return (offset + 7) // 8 * 8
+
+
+def write_archive(file_name, brains):
+    """Writes many brains into one archive file
+
+    Args:
+        file_name (str): Path of the archive
+        brains (Iterable[Brain]): The brains
+    """
+    nodes = []
+    connections = []
+    index = []
+    num_nodes = num_connections = 0
+
+    for brain in brains:
+        node_data = NodeTable.data_of(brain.nodes)
+        connection_data = ConnectionTable.data_of(brain.connections)
+
+        index.append((brain.id, brain.fitness, num_nodes, len(node_data), num_connections, len(connection_data)))
+        nodes.append(node_data)
+        connections.append(connection_data)
+        num_nodes += len(node_data)
+        num_connections += len(connection_data)
+
+    sections = [
+        numpy.concatenate(nodes) if nodes else numpy.zeros(0, dtype=NODE_DTYPE),
+        numpy.concatenate(connections) if connections else numpy.zeros(0, dtype=CONN_DTYPE),
+        numpy.array(index, dtype=INDEX_DTYPE)
+    ]
+
+    offsets = []
+    offset = HEADER_DTYPE.itemsize
+    for section in sections:
+        offset = _aligned(offset)
+        offsets.append(offset)
+        offset += section.nbytes
+
+    header = numpy.array([(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(index),
+                           offsets[0], num_nodes, offsets[1], num_connections, offsets[2])], dtype=HEADER_DTYPE)
+
+    with open(file_name, 'wb') as file:
+        file.write(header.tobytes())
+
+        for offset, section in zip(offsets, sections):
+            file.write(b'\x00' * (offset - file.tell()))
+            file.write(section.tobytes())
+
+
+class GenomeArchive:
+    def __init__(self, file_name):
+        """Opens an archive written by write_archive without reading it
+
+        The file is memory mapped and the tables are views on the mapping, so opening is
+        instant and a genome only reads its own rows.
+
+        Args:
+            file_name (str): Path of the archive
+
+        Contains:
+            index (numpy.ndarray): One INDEX_DTYPE row per genome
+            nodes (numpy.ndarray): The node rows of all the genomes
+            connections (numpy.ndarray): The connection rows of all the genomes
+        """
+        self.buffer = numpy.memmap(file_name, dtype=numpy.uint8, mode='r')
+        header = self.buffer[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+
+        if header['magic'] != ARCHIVE_MAGIC:
+            raise ValueError(f'{file_name} is not a genome archive')
+        if header['version'] != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported archive version {header['version']}")
+
+        self.nodes = self._section(header['nodes'], header['num_nodes'], NODE_DTYPE)
+        self.connections = self._section(header['connections'], header['num_connections'], CONN_DTYPE)
+        self.index = self._section(header['index'], header['count'], INDEX_DTYPE)
+        self._rows = None
+
+    def _section(self, offset, count, dtype):
+        offset = int(offset)
+        return self.buffer[offset:offset + int(count) * dtype.itemsize].view(dtype)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, row):
+        """Opens the genome of a row without copying it
+
+        Args:
+            row (int): Row of the genome in the archive
+
+        Returns:
+            ArrayBrain: The genome. Its tables are read only views, use copy() before mutating it
+        """
+        brain_id, fitness, node_start, node_count, connection_start, connection_count = self.index[row].tolist()
+
+        brain = ArrayBrain.__new__(ArrayBrain)
+        brain.__setstate__((
+            brain_id,
+            fitness,
+            self.nodes[node_start:node_start + node_count],
+            self.connections[connection_start:connection_start + connection_count]
+        ))
+
+        return brain
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+    def get(self, brain_id):
+        """Opens the genome with the given ID
+
+        Args:
+            brain_id (int): ID of the genome
+
+        Returns:
+            ArrayBrain: The genome, or None if the archive does not contain it
+        """
+        if self._rows is None:
+            self._rows = {brain_id: row for row, brain_id in enumerate(self.index['id'].tolist())}
+
+        row = self._rows.get(brain_id)
+        return None if row is None else self[row]
+
+
+def convert_json(file_names, archive_name):
+    """Packs brains saved with save_brain into one archive
+
+    Args:
+        file_names (List[str]): Paths of the JSON files
+        archive_name (str): Path of the archive
+
+    Returns:
+        int: Number of converted genomes
+    """
+    brains = [load_brain(file_name, Brain) for file_name in file_names]
+    write_archive(archive_name, brains)
+
+    return len(brains)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Packs brains saved as JSON into one genome archive')
+    parser.add_argument('archive', help='path of the archive to write')
+    parser.add_argument('files', nargs='+', help='JSON files or glob patterns')
+    args = parser.parse_args()
+
+    file_names = sorted(set(name for pattern in args.files for name in (glob.glob(pattern) or [pattern])))
+    print(f'{convert_json(file_names, args.archive)} genomes written to {args.archive}')
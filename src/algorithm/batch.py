@@ -0,0 +1,198 @@
+import numpy
+
+from .activations import get_activation
+from .options import Options
+
+
+def _layers(plan):
+    """Groups the steps of an evaluation plan into layers
+
+    A node is placed one layer after the deepest node it reads from, so every node of
+    a layer only depends on the inputs, the bias and the nodes of the previous layers.
+
+    Args:
+        plan (EvalPlan): The evaluation plan of a Brain
+
+    Returns:
+        List[List[Tuple[int, Tuple[Tuple[int, int], ...]]]]: The steps of the plan grouped by layer
+    """
+    depth = {}
+    layers = []
+
+    for i, incoming in plan.steps:
+        layer = max([depth[fr] + 1 for fr, _ in incoming if fr in depth], default=0)
+        depth[i] = layer
+
+        if layer == len(layers):
+            layers.append([])
+        layers[layer].append((i, incoming))
+
+    return layers
+
+
+def _layer_indices(nodes):
+    """Flattens the steps of a layer into index arrays
+
+    Args:
+        nodes (List[Tuple[int, Tuple[Tuple[int, int], ...]]]): The steps of the layer
+
+    Returns:
+        Tuple[numpy.ndarray, ...]: Targets of the layer, then slot, edge, source and weight index of every edge
+    """
+    targets = numpy.array([i for i, _ in nodes], dtype=numpy.intp)
+    edges = numpy.array([(k, e, fr, w) for k, (_, incoming) in enumerate(nodes) for e, (fr, w) in enumerate(incoming)],
+                        dtype=numpy.intp).reshape(-1, 4)
+
+    return (targets,) + tuple(edges.T)
+
+
+class BatchNetwork:
+    def __init__(self, brains):
+        """Padded weight tensors of a group of Brains evaluated together
+
+        The brains are grouped by their shared evaluation plan. The layout of every topology
+        is worked out once and written into the rows of all its brains in one numpy
+        assignment, with the weights gathered from the matrix of their weight vectors.
+
+        Args:
+            brains (List[Brain]): The brains in the batch
+
+        Contains:
+            plans (List[EvalPlan]): Evaluation plans of the brains, row by row
+            weights (List[List[float]]): Weight vectors of the brains, row by row
+            rows (Dict[int, int]): Row of each brain in the tensors, keyed by the id of its weight vector
+            fallback (List[int]): Rows of the cyclic brains which are evaluated with Brain.predict
+            width (int): Number of node columns. The last column is a scratch column used by the padding
+            layers (List[Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]): Targets, sources and weights of every layer
+
+        Methods:
+            predict: Predict the outputs of the brains based on a matrix of inputs
+        """
+        self.brains = list(brains)
+        self.plans = [brain._plan or brain._build_plan() for brain in self.brains]
+        self.weights = [brain._weights if brain._weights is not None else brain._build_weights()
+                        for brain in self.brains]
+        self.rows = {id(weights): row for row, weights in enumerate(self.weights)}
+
+        self.fallback = [row for row, plan in enumerate(self.plans) if plan.sweeps > 1]
+
+        groups = {}
+        for row, plan in enumerate(self.plans):
+            groups.setdefault(id(plan), (plan, []))[1].append(row)
+
+        n = len(self.plans)
+        self.width = max([len(brain.nodes) for brain in self.brains], default=0) + 1
+        scratch = self.width - 1
+
+        self.inputs = numpy.full((n, Options.num_inputs), scratch, dtype=numpy.intp)
+        self.outputs = numpy.full((n, Options.num_outputs), scratch, dtype=numpy.intp)
+        self.bias = numpy.full((n, max([len(plan.bias) for plan in self.plans], default=0)), scratch,
+                               dtype=numpy.intp)
+
+        layered = []
+
+        for plan, rows in groups.values():
+            rows = numpy.array(rows, dtype=numpy.intp)
+            self.inputs[rows, :len(plan.inputs)] = plan.inputs
+            self.outputs[rows, :len(plan.outputs)] = plan.outputs
+            self.bias[rows, :len(plan.bias)] = plan.bias
+
+            if plan.sweeps == 1:
+                layers = [_layer_indices(nodes) for nodes in _layers(plan)]
+                matrix = numpy.array([self.weights[row] for row in rows], dtype=float).reshape(len(rows), -1)
+                layered.append((rows[:, None], layers, matrix))
+
+        self.layers = []
+
+        for layer in range(max([len(layers) for _, layers, _ in layered], default=0)):
+            present = [(rows, layers[layer], matrix) for rows, layers, matrix in layered if layer < len(layers)]
+
+            num_nodes = max(len(indices[0]) for _, indices, _ in present)
+            num_conns = max([int(indices[2].max()) + 1 for _, indices, _ in present if len(indices[2])],
+                            default=0)
+
+            targets = numpy.full((n, num_nodes), scratch, dtype=numpy.intp)
+            sources = numpy.full((n, num_nodes, num_conns), scratch, dtype=numpy.intp)
+            weights = numpy.zeros((n, num_nodes, num_conns))
+
+            for rows, (nodes, slots, positions, froms, ws), matrix in present:
+                targets[rows, :len(nodes)] = nodes
+                sources[rows, slots, positions] = froms
+                weights[rows, slots, positions] = matrix[:, ws]
+
+            self.layers.append((targets, sources, weights))
+
+    def __contains__(self, brain):
+        weights = brain._weights
+        row = self.rows.get(id(weights))
+        return row is not None and self.weights[row] is weights and self.plans[row] is brain._plan
+
+    def predict(self, inputs, rows=None):
+        """Predict the outputs of the brains based on the given inputs
+
+        Args:
+            inputs (numpy.ndarray): Matrix of shape (N, num_inputs) with one row of inputs per brain
+            rows (numpy.ndarray, optional): Rows of the brains to evaluate. Defaults to all the brains.
+
+        Returns:
+            numpy.ndarray: Matrix of shape (N, num_outputs) with one row of outputs per brain
+        """
+        if rows is None:
+            rows = numpy.arange(len(self.plans))
+
+        activation_func = get_activation(Options.activation_func, vectorized=True)
+
+        n = len(rows)
+        batch = numpy.arange(n)[:, None]
+        values = numpy.zeros((n, self.width))
+
+        values[batch, self.inputs[rows]] = inputs
+        values[batch, self.bias[rows]] = 1
+
+        for targets, sources, weights in self.layers:
+            sums = (weights[rows] * values[batch[:, :, None], sources[rows]]).sum(axis=2)
+            values[batch, targets[rows]] = activation_func(sums)
+
+        outputs = values[batch, self.outputs[rows]]
+
+        if self.fallback:
+            positions = {row: k for k, row in enumerate(rows)}
+            for row in self.fallback:
+                k = positions.get(row)
+                if k is not None:
+                    outputs[k] = self.brains[row].predict(list(inputs[k]))
+
+        return outputs
+
+
+_cache = {'network': None}
+
+
+def predict_batch(brains, inputs):
+    """Predict the outputs of many brains in one vectorized pass per layer
+
+    The padded tensors are cached and reused as long as every brain keeps the
+    evaluation plan and weights it had when they were built, so a shrinking population
+    only selects rows of the cached tensors.
+
+    Args:
+        brains (List[Brain]): The brains to evaluate
+        inputs (Sequence[Sequence[float]]): One list of inputs per brain
+
+    Returns:
+        numpy.ndarray: Matrix of shape (N, num_outputs) with one row of outputs per brain
+    """
+    inputs = numpy.asarray(inputs, dtype=float).reshape(len(brains), Options.num_inputs)
+
+    if Options.aggregation_func is not sum:
+        return numpy.array([brain.predict(list(row)) for brain, row in zip(brains, inputs)],
+                           dtype=float).reshape(len(brains), Options.num_outputs)
+
+    network = _cache['network']
+
+    if network is None or not all(brain in network for brain in brains):
+        network = _cache['network'] = BatchNetwork(brains)
+
+    rows = numpy.array([network.rows[id(brain._weights)] for brain in brains], dtype=numpy.intp)
+
+    return network.predict(inputs, rows)
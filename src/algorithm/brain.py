@@ -2,18 +2,21 @@ import random
 
 from .innovation import InnovTable
 from .genes import NodeState, Node, Connection
+from .plans import plan_cache, generate_function, bind_weights, live_nodes
 
 from .options import Options
 
 
 class Brain:
-    def __init__(self, genome_id, nodes=None, connections=None):
+    def __init__(self, genome_id, nodes=None, connections=None, sort_nodes=True):
         """Initialises a Brain object
 
         Args:
             genome_id (int): ID of the Brain object
             nodes (List[Node], optional): Contains a list of nodes generated during crossover. Defaults to None.
             connections (List[Connection], optional): Contains list of connections during crossover. Defaults to None.
+            sort_nodes (bool, optional): Sorts the given nodes by ID. Copies keep the order of their genome, _add_node
+                appends reused IDs and a cyclic genome is evaluated in list order. Defaults to True.
 
         Contains:
             id (int): ID of the Brain
@@ -30,11 +33,18 @@ class Brain:
         self.id = genome_id
         self.fitness = 0
 
+        self._plan = None
+        self._weights = None
+        self._predict_func = None
+        self._node_map = None
+
         self.nodes = nodes
         self.connections = connections
 
         if nodes is not None:            
-            self.nodes.sort(key=lambda x: x.id)
+            if sort_nodes:
+                self.nodes.sort(key=lambda x: x.id)
+            self._sort_connections()
             return
 
         input_pos_x = 1./(Options.num_inputs+1)
@@ -83,6 +93,84 @@ class Brain:
     def __repr__(self):
         return f"Brain ID: {self.id}, fitness: {self.fitness}"
 
+    def copy(self):
+        """Copies the Brain with its own genes so mutating the copy leaves the original untouched
+
+        Returns:
+            Brain: The copied Brain
+        """
+        brain = type(self)(
+            self.id,
+            [node.copy() for node in self.nodes],
+            [conn.copy() for conn in self.connections],
+            sort_nodes=False
+        )
+        brain.fitness = self.fitness
+        brain._plan = self._plan
+
+        return brain
+
+    def __copy__(self):
+        return self.copy()
+
+    def phenotype(self):
+        """Builds the minimal network of the Brain, for inference and compact export
+
+        Disabled connections and dead nodes, see plans.live_nodes, are left out. The Brain itself
+        keeps its full genome, so crossover still aligns the genes by innovation number.
+        A cyclic network is evaluated once per depth level of all its nodes, so it keeps
+        every node and only loses the connections of the dead ones.
+
+        Returns:
+            Brain: The pruned copy of the Brain
+        """
+        plan = self._plan or self._build_plan()
+        live = live_nodes(self.nodes, self.connections)
+
+        brain = type(self)(
+            self.id,
+            [node.copy() for node in self.nodes if node.id in live or plan.sweeps > 1],
+            [conn.copy() for conn in self.connections if conn.enabled and conn.fr in live and conn.to in live],
+            sort_nodes=False
+        )
+        brain.fitness = self.fitness
+
+        return brain
+
+    def __getstate__(self):
+        """Compact pickling state made of plain tuples, without the cached evaluation plan
+
+        Returns:
+            tuple: ID, fitness, node tuples and connection tuples of the Brain
+        """
+        return (
+            self.id,
+            self.fitness,
+            [(node.id, node.state.value, node.x, node.y) for node in self.nodes],
+            [(conn.fr, conn.to, conn.innov, conn.weight, conn.enabled) for conn in self.connections]
+        )
+
+    def __setstate__(self, state):
+        """Rebuilds the Brain from the state returned by __getstate__
+
+        Args:
+            state (tuple): The pickled state
+        """
+        self.id, self.fitness, nodes, connections = state
+        self._plan = None
+        self._weights = None
+        self._predict_func = None
+        self._node_map = None
+
+        self.nodes = [Node(node_id, NodeState(node_state), x, y) for node_id, node_state, x, y in nodes]
+        self.connections = []
+
+        for fr, to, innov, weight, enabled in connections:
+            conn = Connection(fr, to, innov)
+            conn.weight = weight
+            conn.enabled = enabled
+            self.connections.append(conn)
+
     def get_draw_info(self):
         """Can be used to get the info for drawing the neural network
 
@@ -160,8 +248,11 @@ class Brain:
         """
         valid = []
 
-        for node1 in self.nodes:
-            for node2 in self.nodes:
+        sources = self._filter_nodes(NodeState.input, NodeState.hidden, NodeState.bias)
+        targets = self._filter_nodes(NodeState.hidden, NodeState.output)
+
+        for node1 in sources:
+            for node2 in targets:
                 if self._valid_conn(node1, node2):
                     valid.append((node1.id, node2.id))
 
@@ -175,6 +266,9 @@ class Brain:
                     InnovTable.get_innov(node1_id, node2_id).innov
                 )
             )
+            self._index_conn(self.connections[-1])
+            self._sort_connections()
+            self._invalidate_plan()
 
     def _add_node(self):
         """Adds a new node by splitting a connection
@@ -204,6 +298,7 @@ class Brain:
                     x, y
                 )
             )
+            self._index_node(self.nodes[-1])
 
             self.connections.append(
                 Connection(
@@ -213,6 +308,7 @@ class Brain:
                     weight=1
                 )
             )
+            self._index_conn(self.connections[-1])
 
             self.connections.append(
                 Connection(
@@ -222,16 +318,32 @@ class Brain:
                     weight=conn.weight
                 )
             )
+            self._index_conn(self.connections[-1])
+            self._sort_connections()
+            self._invalidate_plan()
 
     def mutate(self):
         """Mutates the Brain according mutation rates defined in Options
         """
+        self._mutate_structure()
+        self._mutate_weights()
+        self._invalidate_weights()
+
+    def _mutate_structure(self):
+        """Adds a node and/or a connection according to the mutation rates defined in Options
+        """
         if random.random() < Options.add_node_prob and len(self.nodes) < Options.max_nodes:
             self._add_node()
 
         if random.random() < Options.add_conn_prob:
             self._add_conn()
 
+        # the lookup tables are only needed while mutating, a genome keeps only its genes
+        self._drop_index()
+
+    def _mutate_weights(self):
+        """Perturbs or replaces the weights of the connections according to the mutation rates defined in Options
+        """
         for conn in self.connections:
             if random.random() < Options.weight_mutate_prob:
                 if random.random() < Options.new_weight_prob:
@@ -239,6 +351,61 @@ class Brain:
                 else:
                     conn.weight += random.uniform(-1, 1) * Options.weight_mutate_power
 
+    def _sort_connections(self):
+        """Keeps the connections sorted by innovation number, which crossover and compat_dist rely on
+        """
+        self.connections.sort(key=lambda x: x.innov)
+
+    def _build_index(self):
+        """Builds the lookup tables of the genome: node ID to node, (fr, to) to connection
+        and the incoming and outgoing connections of every node. They are built on first use
+        and then kept up to date by _add_node and _add_conn
+        """
+        self._node_map = {node.id: node for node in self.nodes}
+        self._index_connections()
+
+    def _drop_index(self):
+        """Frees the lookup tables, they are built again on the next lookup
+        """
+        self._node_map = None
+        self._edges = None
+        self._incoming = None
+        self._outgoing = None
+
+    def _index_connections(self):
+        """Rebuilds the connection lookup tables from self.connections
+        """
+        self._edges = {}
+        self._incoming = {node_id: [] for node_id in self._node_map}
+        self._outgoing = {node_id: [] for node_id in self._node_map}
+
+        for conn in self.connections:
+            self._index_conn(conn)
+
+    def _index_node(self, node):
+        """Adds a node to the lookup tables
+
+        Args:
+            node (Node): The node
+        """
+        if self._node_map is None:
+            return
+
+        self._node_map[node.id] = node
+
+    def _index_conn(self, conn):
+        """Adds a connection to the lookup tables
+
+        Args:
+            conn (Connection): The connection
+        """
+        if self._node_map is None:
+            return
+
+        self._edges[(conn.fr, conn.to)] = conn
+        self._incoming.setdefault(conn.to, []).append(conn)
+        self._outgoing.setdefault(conn.fr, []).append(conn)
+
     def _get_input_connections(self, node_id):
         """Returns all connections where the connection leads to a node with given node_id
 
@@ -248,7 +415,24 @@ class Brain:
         Returns:
             List[Connections]: List of the connections where connection.to is node_id
         """
-        return [conn for conn in self.connections if conn.to == node_id]
+        if self._node_map is None:
+            self._build_index()
+
+        return self._incoming.get(node_id, [])
+
+    def _get_output_connections(self, node_id):
+        """Returns all connections where the connection starts at the node with given node_id
+
+        Args:
+            node_id (int): ID of the node
+
+        Returns:
+            List[Connections]: List of the connections where connection.fr is node_id
+        """
+        if self._node_map is None:
+            self._build_index()
+
+        return self._outgoing.get(node_id, [])
 
     def _get_node(self, node_id):
         """Returns node with given node_id in self.nodes
@@ -259,9 +443,10 @@ class Brain:
         Returns:
             Node: The Node which has the id -> node_id
         """
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
+        if self._node_map is None:
+            self._build_index()
+
+        return self._node_map.get(node_id)
 
     def _valid_conn(self, node1, node2):
         """Checks if the connection between the given nodes is possible
@@ -273,9 +458,11 @@ class Brain:
         Returns:
             bool: Is the connection valid
         """
-        for conn in self.connections:
-            if conn.fr == node1.id and conn.to == node2.id:
-                return False
+        if self._node_map is None:
+            self._build_index()
+
+        if (node1.id, node2.id) in self._edges:
+            return False
 
         return (
             node1.id != node2.id and
@@ -284,9 +471,70 @@ class Brain:
             node1.y <= node2.y
         )
 
+    def _invalidate_plan(self):
+        """Drops the cached evaluation plan and weights. They are rebuilt on the next call to predict
+        """
+        self._plan = None
+        self._weights = None
+        self._predict_func = None
+
+    def _invalidate_weights(self):
+        """Drops the cached weights after a weight only change. The shared plan stays valid
+        """
+        self._weights = None
+        self._predict_func = None
+
+    def _build_predict_func(self):
+        """Binds the weights of the Brain to the generated function of its plan
+
+        Returns:
+            Callable[[List[float]], List[float]]: The predict function of the Brain
+        """
+        plan = self._plan or self._build_plan()
+        weights = self._weights if self._weights is not None else self._build_weights()
+
+        self._predict_func = bind_weights(plan.function or generate_function(plan), weights)
+
+        return self._predict_func
+
+    def _topology_key(self):
+        """Structural key of the Brain: the ID, state and depth of every node and the enabled connections
+
+        Brains with the same key have the same evaluation plan and only differ in their weights.
+
+        Returns:
+            tuple: The key
+        """
+        return (
+            tuple([(node.id, node.state, node.y) for node in self.nodes]),
+            tuple([(conn.fr, conn.to) for conn in self.connections if conn.enabled])
+        )
+
+    def _build_plan(self):
+        """Gets the evaluation plan of the topology of the Brain from the shared plan cache
+
+        Returns:
+            EvalPlan: The evaluation plan
+        """
+        self._plan = plan_cache.get(self._topology_key(), self.nodes, self.connections)
+
+        return self._plan
+
+    def _build_weights(self):
+        """Collects the weights of the enabled connections, in the order the weight indices of the plan refer to
+
+        Returns:
+            List[float]: The weights
+        """
+        self._weights = [conn.weight for conn in self.connections if conn.enabled]
+
+        return self._weights
+
     def predict(self, inputs):
         """Predict the outputs based on the given inputs
 
+        Acyclic genomes are evaluated in topological order, see compile_plan.
+
         Args:
             inputs (List[float]): The inputs to the neural network
 
@@ -295,27 +543,25 @@ class Brain:
         """
         assert len(inputs) == Options.num_inputs
 
-        depth = len(set([nn.y for nn in self.nodes]))
+        if Options.compiled_predict:
+            return (self._predict_func or self._build_predict_func())(inputs)
 
-        for node in self.nodes:
-            node.val = 0
+        plan = self._plan or self._build_plan()
+        weights = self._weights if self._weights is not None else self._build_weights()
 
-        for _ in range(depth):
-            inp_num = 0
+        activation_func = Options.activation_func
+        aggregation_func = Options.aggregation_func
 
-            for node in self.nodes:
-                if node.state == NodeState.input:
-                    node.val = inputs[inp_num]
-                    inp_num += 1
+        values = [0] * len(self.nodes)
 
-                elif node.state == NodeState.bias:
-                    node.val = 1
+        for i, value in zip(plan.inputs, inputs):
+            values[i] = value
 
-                else:
-                    values = []
-                    for conn in self._get_input_connections(node.id):
-                        if conn.enabled: values.append(conn.weight * self._get_node(conn.fr).val)
+        for i in plan.bias:
+            values[i] = 1
 
-                    node.val = Options.activation_func(Options.aggregation_func(values))
+        for _ in range(plan.sweeps):
+            for i, incoming in plan.steps:
+                values[i] = activation_func(aggregation_func([weights[w] * values[fr] for fr, w in incoming]))
 
-        return [node.val for node in self.nodes if node.state == NodeState.output]
\ No newline at end of file
+        return [values[i] for i in plan.outputs]
@@ -0,0 +1,204 @@
+import os
+import pickle
+import random
+
+import numpy
+
+from .brain import Brain
+from .genome import ArrayBrain, NodeTable, ConnectionTable, NODE_STATES
+from .innovation import Innovation, InnovTable
+from .options import Options
+from .species import Species
+
+CHECKPOINT_VERSION = 1
+
+INNOV_DTYPE = numpy.dtype([
+    ('innov', numpy.int64),
+    ('new_conn', numpy.bool_),
+    ('fr', numpy.int64),
+    ('to', numpy.int64),
+    ('node_id', numpy.int64)
+])
+
+SPECIES_DTYPE = numpy.dtype([
+    ('id', numpy.int64),
+    ('age', numpy.int64),
+    ('stagnation', numpy.int64),
+    ('spawns_required', numpy.float64),
+    ('max_fitness', numpy.float64),
+    ('average_fitness', numpy.float64),
+    ('best', numpy.int64)
+])
+
+
+def _offsets(sizes):
+    return numpy.concatenate([[0], numpy.cumsum(sizes, dtype=numpy.int64)])
+
+
+def save_checkpoint(population, file_name):
+    """Saves the whole state of the evolution in a compact binary file
+
+    The file is a numpy .npz archive. The genes of all the brains are stored as two fixed width
+    tables, nodes and connections, with an offset index per brain. The species and the
+    innovations are tables too. The rest, counters, Options, the states of the random
+    generators and population.extra, is a small pickled header. The file is written next to its destination and then
+    moved in place, so a crash never leaves a half written checkpoint.
+
+    Args:
+        population (Population): The population
+        file_name (str): Path of the checkpoint
+    """
+    brains = list(population.pool)
+    rows = {id(brain): row for row, brain in enumerate(brains)}
+
+    def ref(brain):
+        if id(brain) not in rows:
+            rows[id(brain)] = len(brains)
+            brains.append(brain)
+        return rows[id(brain)]
+
+    best = ref(population.best)
+    species = numpy.zeros(len(population.species), dtype=SPECIES_DTYPE)
+    members = []
+
+    for k, sp in enumerate(population.species):
+        species[k] = (sp.id, sp.age, sp.stagnation, sp.spawns_required, sp.max_fitness, sp.average_fitness,
+                      ref(sp.best))
+        members.append([ref(brain) for brain in sp.pool])
+
+    nodes = [NodeTable.data_of(brain.nodes) for brain in brains]
+    connections = [ConnectionTable.data_of(brain.connections) for brain in brains]
+
+    innovations = list({id(innovation): innovation
+                        for innovation in list(InnovTable.index.values()) + InnovTable.history}.values())
+    positions = {id(innovation): k for k, innovation in enumerate(innovations)}
+    indexed = set(id(innovation) for innovation in InnovTable.index.values())
+
+    header = {
+        'version': CHECKPOINT_VERSION,
+        'options': Options.get_options(),
+        'innov': InnovTable.innov,
+        'node_id': InnovTable.node_id,
+        'gen': population.gen,
+        'brain_id': population.brain_id,
+        'species_id': population.species_id,
+        'pool_size': len(population.pool),
+        'best': best,
+        'random': random.getstate(),
+        'numpy_random': numpy.random.get_state(),
+        'rng': population.rng,
+        'extra': population.extra
+    }
+
+    arrays = {
+        'header': numpy.frombuffer(pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL), dtype=numpy.uint8),
+        'ids': numpy.array([brain.id for brain in brains], dtype=numpy.int64),
+        'fitness': numpy.array([brain.fitness for brain in brains], dtype=numpy.float64),
+        'nodes': numpy.concatenate(nodes) if nodes else numpy.zeros(0, dtype=NodeTable.dtype),
+        'node_offsets': _offsets([len(data) for data in nodes]),
+        'connections': numpy.concatenate(connections) if connections else numpy.zeros(0, dtype=ConnectionTable.dtype),
+        'connection_offsets': _offsets([len(data) for data in connections]),
+        'species': species,
+        'members': numpy.array([row for member_rows in members for row in member_rows], dtype=numpy.int64),
+        'member_offsets': _offsets([len(member_rows) for member_rows in members]),
+        'innovations': numpy.array([(innovation.innov, innovation.new_conn, innovation.fr, innovation.to,
+                                     -1 if innovation.node_id is None else innovation.node_id)
+                                    for innovation in innovations], dtype=INNOV_DTYPE),
+        'history': numpy.array([positions[id(innovation)] for innovation in InnovTable.history], dtype=numpy.int64),
+        'indexed': numpy.array([id(innovation) in indexed for innovation in innovations], dtype=numpy.bool_)
+    }
+
+    temp_name = file_name + '.tmp'
+    with open(temp_name, 'wb') as file:
+        numpy.savez(file, **arrays)
+    os.replace(temp_name, file_name)
+
+
+def _load_brain(brain_class, brain_id, fitness, nodes, connections):
+    brain = brain_class.__new__(brain_class)
+
+    if brain_class is ArrayBrain:
+        brain.__setstate__((brain_id, fitness, nodes.copy(), connections.copy()))
+    else:
+        brain.__setstate__((
+            brain_id,
+            fitness,
+            [(node_id, NODE_STATES[state].value, x, y) for node_id, state, x, y in nodes.tolist()],
+            [(fr, to, innov, weight, enabled) for innov, fr, to, weight, enabled in connections.tolist()]
+        ))
+
+    return brain
+
+
+def restore_checkpoint(population, file_name):
+    """Restores a checkpoint written by save_checkpoint
+
+    Options, the innovation table and the random generators are global, so they are restored
+    too and the evolution continues exactly as if it had never stopped.
+    The header is unpickled, so only load checkpoints from a trusted source.
+
+    Args:
+        population (Population): The population to restore into, its previous state is replaced
+        file_name (str): Path of the checkpoint
+    """
+    with numpy.load(file_name, allow_pickle=False) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+
+    header = pickle.loads(arrays['header'].tobytes())
+    if header['version'] != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {header['version']}")
+
+    Options.load_options(header['options'])
+    brain_class = ArrayBrain if Options.array_genome else Brain
+
+    node_offsets = arrays['node_offsets']
+    connection_offsets = arrays['connection_offsets']
+
+    brains = [
+        _load_brain(
+            brain_class,
+            brain_id,
+            fitness,
+            arrays['nodes'][node_offsets[row]:node_offsets[row + 1]],
+            arrays['connections'][connection_offsets[row]:connection_offsets[row + 1]]
+        )
+        for row, (brain_id, fitness) in enumerate(zip(arrays['ids'].tolist(), arrays['fitness'].tolist()))
+    ]
+
+    member_offsets = arrays['member_offsets']
+    members = arrays['members'].tolist()
+    species = []
+
+    for k, (species_id, age, stagnation, spawns_required, max_fitness, average_fitness, best) in \
+            enumerate(arrays['species'].tolist()):
+        sp = Species(species_id, brains[best])
+        sp.pool = [brains[row] for row in members[member_offsets[k]:member_offsets[k + 1]]]
+        sp.age = age
+        sp.stagnation = stagnation
+        sp.spawns_required = spawns_required
+        sp.max_fitness = max_fitness
+        sp.average_fitness = average_fitness
+        species.append(sp)
+
+    innovations = [Innovation(innov, new_conn, fr, to, None if node_id < 0 else node_id)
+                   for innov, new_conn, fr, to, node_id in arrays['innovations'].tolist()]
+
+    InnovTable.history = [innovations[k] for k in arrays['history'].tolist()]
+    InnovTable.index = {(innovation.fr, innovation.to, innovation.new_conn): innovation
+                        for innovation, indexed in zip(innovations, arrays['indexed'].tolist()) if indexed}
+    InnovTable.innov = header['innov']
+    InnovTable.node_id = header['node_id']
+
+    population.brain_class = brain_class
+    population.pool = brains[:header['pool_size']]
+    population.species = species
+    population.best = brains[header['best']]
+    population.gen = header['gen']
+    population.brain_id = header['brain_id']
+    population.species_id = header['species_id']
+    population.metrics = None
+    population.rng = header['rng']
+    population.extra = header.get('extra', {})
+
+    random.setstate(header['random'])
+    numpy.random.set_state(header['numpy_random'])
@@ -4,6 +4,8 @@ from pygame.color import THECOLORS as colors
 from pygame import Rect
 
 _species_colors = {}
+# own generator, drawing must not change the random sequence of the evolution
+_color_random = random.Random(0)
 
 
 def draw_brain_pygame(screen, brain, x=50, y=50, dim=300, circle_size=15, line_width=4):
@@ -38,7 +40,7 @@ def draw_species_bar_pygame(screen, population, x=0, y=0, width=400, height=100)
     for sp in population.species:
         color = _species_colors.get(sp.id)
         if color is None:
-            color = tuple(random.randrange(255) for _ in range(3))
+            color = tuple(_color_random.randrange(255) for _ in range(3))
             _species_colors[sp.id] = color
 
         w = int((sp.spawns_required / s) * width)
@@ -14,6 +14,8 @@ class NodeState(enum.Enum):
     bias = 'bias'
 
 class Node:
+    __slots__ = ('id', 'state', 'x', 'y', 'val')
+
     def __init__(self, node_id, state, x, y):
         """Node gene
 
@@ -31,7 +33,25 @@ class Node:
 
         self.val = 0
 
+    def copy(self):
+        """Copies the node gene without going through __init__
+
+        Returns:
+            Node: The copy
+        """
+        node = Node.__new__(Node)
+        node.id = self.id
+        node.state = self.state
+        node.x = self.x
+        node.y = self.y
+        node.val = 0
+        return node
+
+    __copy__ = copy
+
 class Connection:
+    __slots__ = ('fr', 'to', 'weight', 'enabled', 'innov')
+
     def __init__(self, fr, to, innov, weight=None):
         """Connection gene
 
@@ -47,4 +67,20 @@ class Connection:
 
         self.weight = weight or random.uniform(-1, 1)
         self.enabled = True
-        self.innov = innov
\ No newline at end of file
+        self.innov = innov
+
+    def copy(self):
+        """Copies the connection gene without going through __init__
+
+        Returns:
+            Connection: The copy
+        """
+        conn = Connection.__new__(Connection)
+        conn.fr = self.fr
+        conn.to = self.to
+        conn.weight = self.weight
+        conn.enabled = self.enabled
+        conn.innov = self.innov
+        return conn
+
+    __copy__ = copy
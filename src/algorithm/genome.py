@@ -0,0 +1,287 @@
+import numpy
+
+from .brain import Brain
+from .genes import NodeState, Node, Connection
+from .options import Options
+
+NODE_STATES = [NodeState.bias, NodeState.input, NodeState.output, NodeState.hidden]
+_state_codes = {state: code for code, state in enumerate(NODE_STATES)}
+
+NODE_DTYPE = numpy.dtype([
+    ('id', numpy.int32),
+    ('state', numpy.int8),
+    ('x', numpy.float64),
+    ('y', numpy.float64)
+])
+
+CONN_DTYPE = numpy.dtype([
+    ('innov', numpy.int32),
+    ('fr', numpy.int32),
+    ('to', numpy.int32),
+    ('weight', numpy.float64),
+    ('enabled', numpy.bool_)
+])
+
+
+def _field(name):
+    def get(self):
+        return self._table.data[name][self._index].item()
+
+    def set(self, value):
+        self._table.data[name][self._index] = value
+
+    return property(get, set)
+
+
+class NodeView:
+    """Node gene stored in a row of a NodeTable. It has the same attributes as Node
+    """
+    __slots__ = ('_table', '_index')
+
+    id = _field('id')
+    x = _field('x')
+    y = _field('y')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    @property
+    def state(self):
+        return NODE_STATES[self._table.data['state'][self._index]]
+
+    @state.setter
+    def state(self, value):
+        self._table.data['state'][self._index] = _state_codes[value]
+
+    def copy(self):
+        return Node(self.id, self.state, self.x, self.y)
+
+    __copy__ = copy
+
+
+class ConnectionView:
+    """Connection gene stored in a row of a ConnectionTable. It has the same attributes as Connection
+    """
+    __slots__ = ('_table', '_index')
+
+    innov = _field('innov')
+    fr = _field('fr')
+    to = _field('to')
+    weight = _field('weight')
+    enabled = _field('enabled')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def copy(self):
+        conn = Connection(self.fr, self.to, self.innov)
+        conn.weight = self.weight
+        conn.enabled = self.enabled
+        return conn
+
+    __copy__ = copy
+
+
+class GeneTable:
+    dtype = None
+    view = None
+
+    def __init__(self, data=None):
+        """List-like table of genes stored in a numpy structured array
+
+        Args:
+            data (numpy.ndarray, optional): The rows of the table. Defaults to an empty table.
+
+        Contains:
+            data (numpy.ndarray): One row per gene, every field is a contiguous column
+        """
+        self.data = numpy.zeros(0, dtype=self.dtype) if data is None else data
+
+    @classmethod
+    def from_genes(cls, genes):
+        """Packs a list of gene objects into a table
+
+        Args:
+            genes (List[Node] or List[Connection]): The genes
+
+        Returns:
+            GeneTable: The table
+        """
+        table = cls()
+        table.data = numpy.array([table._row(gene) for gene in genes], dtype=cls.dtype)
+        return table
+
+    @classmethod
+    def data_of(cls, genes):
+        """Returns the rows of a table or of a list of gene objects as a structured array
+
+        Args:
+            genes (GeneTable or List[Node] or List[Connection]): The genes
+
+        Returns:
+            numpy.ndarray: The rows, not copied if genes is already a table
+        """
+        if isinstance(genes, GeneTable):
+            return genes.data
+
+        if not len(genes):
+            return numpy.zeros(0, dtype=cls.dtype)
+
+        return cls.from_genes(genes).data
+
+    def _row(self, gene):
+        raise NotImplementedError
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.data)
+        if not 0 <= index < len(self.data):
+            raise IndexError(index)
+
+        return self.view(self, index)
+
+    def __iter__(self):
+        view = self.view
+        return (view(self, index) for index in range(len(self.data)))
+
+    def append(self, gene):
+        row = numpy.array([self._row(gene)], dtype=self.dtype)
+        self.data = numpy.concatenate((self.data, row))
+
+    def sort(self, key=None):
+        if key is None:
+            order = numpy.argsort(self.data[self.dtype.names[0]], kind='stable')
+        else:
+            order = sorted(range(len(self.data)), key=lambda index: key(self[index]))
+
+        self.data = self.data[order]
+
+    def copy(self):
+        return type(self)(self.data.copy())
+
+
+class NodeTable(GeneTable):
+    dtype = NODE_DTYPE
+    view = NodeView
+
+    def _row(self, node):
+        return node.id, _state_codes[node.state], node.x, node.y
+
+
+class ConnectionTable(GeneTable):
+    dtype = CONN_DTYPE
+    view = ConnectionView
+
+    def _row(self, conn):
+        return conn.innov, conn.fr, conn.to, conn.weight, conn.enabled
+
+
+class ArrayBrain(Brain):
+    def __init__(self, genome_id, nodes=None, connections=None, sort_nodes=True):
+        """Brain which stores its genome as numpy structured arrays
+
+        The nodes and connections are NodeTable and ConnectionTable objects. They behave like the
+        lists of a Brain, so crossover, speciation, saving and drawing work unchanged, while
+        mutation and the vectorized engines can work on the whole columns at once.
+
+        Args:
+            genome_id (int): ID of the Brain object
+            nodes (List[Node] or NodeTable, optional): Nodes generated during crossover. Defaults to None.
+            connections (List[Connection] or ConnectionTable, optional): Connections generated during crossover. Defaults to None.
+            sort_nodes (bool, optional): Sorts the given nodes by ID, see Brain. Defaults to True.
+        """
+        Brain.__init__(self, genome_id, nodes, connections, sort_nodes)
+
+        if not isinstance(self.nodes, NodeTable):
+            self.nodes = NodeTable.from_genes(self.nodes)
+
+        if not isinstance(self.connections, ConnectionTable):
+            self.connections = ConnectionTable.from_genes(self.connections)
+
+        self._node_map = None
+
+    def copy(self):
+        brain = ArrayBrain(self.id, self.nodes.copy(), self.connections.copy(), sort_nodes=False)
+        brain.fitness = self.fitness
+        brain._plan = self._plan
+
+        return brain
+
+    def __getstate__(self):
+        return self.id, self.fitness, self.nodes.data, self.connections.data
+
+    def __setstate__(self, state):
+        self.id, self.fitness, nodes, connections = state
+        self._plan = None
+        self._weights = None
+        self._predict_func = None
+
+        self.nodes = NodeTable(nodes)
+        self.connections = ConnectionTable(connections)
+        self._node_map = None
+
+    @classmethod
+    def from_brain(cls, brain):
+        """Converts a Brain into an ArrayBrain
+
+        Args:
+            brain (Brain): The Brain
+
+        Returns:
+            ArrayBrain: The converted Brain
+        """
+        array_brain = cls(brain.id, list(brain.nodes), list(brain.connections), sort_nodes=False)
+        array_brain.fitness = brain.fitness
+
+        return array_brain
+
+    def _sort_connections(self):
+        if isinstance(self.connections, ConnectionTable):
+            self.connections.sort()
+            if self._node_map is not None:
+                # the views in the lookup tables point to rows, which moved
+                self._index_connections()
+        else:
+            Brain._sort_connections(self)
+
+    def _topology_key(self):
+        if not isinstance(self.connections, ConnectionTable):
+            return Brain._topology_key(self)
+
+        nodes = self.nodes.data
+        connections = self.connections.data[self.connections.data['enabled']]
+
+        return (
+            nodes['id'].tobytes(),
+            nodes['state'].tobytes(),
+            nodes['y'].tobytes(),
+            connections['fr'].tobytes(),
+            connections['to'].tobytes()
+        )
+
+    def _build_weights(self):
+        if not isinstance(self.connections, ConnectionTable):
+            return Brain._build_weights(self)
+
+        data = self.connections.data
+        self._weights = data['weight'][data['enabled']].tolist()
+
+        return self._weights
+
+    def _mutate_weights(self):
+        """Perturbs or replaces all the weights at once according to the mutation rates defined in Options
+        """
+        weights = self.connections.data['weight']
+        n = len(weights)
+
+        mutated = numpy.random.random(n) < Options.weight_mutate_prob
+        replaced = mutated & (numpy.random.random(n) < Options.new_weight_prob)
+        perturbed = mutated & ~replaced
+
+        weights[replaced] = numpy.random.uniform(-1, 1, replaced.sum()) * Options.weight_init_range
+        weights[perturbed] += numpy.random.uniform(-1, 1, perturbed.sum()) * Options.weight_mutate_power
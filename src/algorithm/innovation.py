@@ -1,4 +1,6 @@
 class Innovation:
+    __slots__ = ('innov', 'new_conn', 'fr', 'to', 'node_id')
+
     def __init__(self, innov, new_conn, fr=None, to=None, node_id=None):
         """Innovation details
 
@@ -19,11 +21,13 @@ class InnovTable:
     """Innovation Table of the whole NEAT algorithm. It is a static class
     
     Contains:
-        history (List[Innovation]): List of all the innovations occured
+        history (List[Innovation]): List of all the innovations occured, or only the latest ones after compact
+        index (Dict[Tuple[int, int, bool], Innovation]): The innovations keyed by (fr, to, new_conn)
         innov (int): The next innovation ID
         node_id (int): The next node ID
     """
     history = []
+    index = {}
     innov = 0
     node_id = 0
 
@@ -56,6 +60,7 @@ class InnovTable:
             InnovTable.node_id += 1
 
         InnovTable.history.append(innovation)
+        InnovTable.index[(fr, to, new_conn)] = innovation
         InnovTable.innov += 1
 
         return innovation
@@ -72,8 +77,42 @@ class InnovTable:
         Returns:
             Innovation: The innovation
         """
-        for innovation in InnovTable.history:
-            if innovation.new_conn == new_conn and innovation.fr == fr and innovation.to == to:
-                return innovation
+        innovation = InnovTable.index.get((fr, to, new_conn))
+        if innovation is not None:
+            return innovation
+
+        return InnovTable._create_innov(fr, to, new_conn)
+
+    @staticmethod
+    def compact(genomes, history_limit):
+        """Bounds the memory of the table. Only the latest history_limit innovations are kept in the history.
+        Older innovations stay in the index while a gene of the given genomes still uses them, so their
+        innovation numbers and node IDs never change. The rest are forgotten
+
+        Args:
+            genomes (List[Brain]): The genomes which are still alive
+            history_limit (int): Number of recent innovations kept in the history
+        """
+        if len(InnovTable.history) <= history_limit:
+            return
+
+        live_conns = set()
+        live_nodes = set()
+        for genome in genomes:
+            live_conns.update(conn.innov for conn in genome.connections)
+            live_nodes.update(node.id for node in genome.nodes)
+
+        InnovTable.history = InnovTable.history[len(InnovTable.history) - history_limit:]
+        recent = set(id(innovation) for innovation in InnovTable.history)
+
+        for key, innovation in list(InnovTable.index.items()):
+            if id(innovation) in recent:
+                continue
+
+            if innovation.new_conn:
+                live = innovation.innov in live_conns
+            else:
+                live = innovation.node_id in live_nodes
 
-        return InnovTable._create_innov(fr, to, new_conn)
\ No newline at end of file
+            if not live:
+                del InnovTable.index[key]
\ No newline at end of file
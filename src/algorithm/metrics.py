@@ -0,0 +1,133 @@
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Metrics:
+    def __init__(self, trace_allocations=False):
+        """Per generation metrics of the phases of Population.epoch
+
+        Attach it with population.metrics = Metrics(). While population.metrics is None
+        epoch does not measure anything.
+
+        Args:
+            trace_allocations (bool, optional): Also record the bytes allocated by every phase with tracemalloc. Slows the run down. Defaults to False.
+
+        Contains:
+            generations (List[dict]): One record per generation, in the form of:
+
+            {
+                'gen': <int>,
+                'phases': {
+                    '<phase>': {'time': <float>, 'blocks': <int>, 'bytes': <int>, 'peak_bytes': <int>}
+                },
+                'sizes': {'<name>': <number>}
+            }
+
+            where blocks is the change in allocated memory blocks during the phase.
+            bytes and peak_bytes are only present if trace_allocations is enabled
+            callbacks (List[Callable[[dict], None]]): Called with every finished record
+        """
+        self.trace_allocations = trace_allocations
+        self.generations = []
+        self.callbacks = []
+        self.current = None
+
+    def add_callback(self, callback):
+        """Registers a function called with the record of every finished generation
+
+        Args:
+            callback (Callable[[dict], None]): The function
+        """
+        self.callbacks.append(callback)
+
+    def start_generation(self, gen):
+        self.current = {'gen': gen, 'phases': {}, 'sizes': {}}
+
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def end_generation(self):
+        record = self.current
+        self.generations.append(record)
+        self.current = None
+
+        for callback in self.callbacks:
+            callback(record)
+
+        return record
+
+    def record(self, name, value):
+        """Records a size of the current generation, like the number of species
+
+        Args:
+            name (str): Name of the size
+            value (float): The value
+        """
+        self.current['sizes'][name] = value
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager measuring a phase of the current generation
+
+        Args:
+            name (str): Name of the phase
+        """
+        tracing = self.trace_allocations and tracemalloc.is_tracing()
+        if tracing:
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            start_bytes = tracemalloc.get_traced_memory()[0]
+
+        start_blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+
+        yield
+
+        measured = {
+            'time': time.perf_counter() - start,
+            'blocks': sys.getallocatedblocks() - start_blocks
+        }
+
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            measured['bytes'] = current - start_bytes
+            measured['peak_bytes'] = peak - start_bytes
+
+        self.current['phases'][name] = measured
+
+    def summary(self):
+        """Totals of every phase over all the recorded generations
+
+        Returns:
+            Dict[str, dict]: Total time, mean time and total blocks of every phase
+        """
+        totals = {}
+
+        for record in self.generations:
+            for name, measured in record['phases'].items():
+                total = totals.setdefault(name, {'time': 0.0, 'blocks': 0, 'count': 0})
+                total['time'] += measured['time']
+                total['blocks'] += measured['blocks']
+                total['count'] += 1
+
+        for total in totals.values():
+            total['mean_time'] = total['time'] / total['count']
+
+        return totals
+
+    def __str__(self):
+        summary = self.summary()
+        total_time = sum(total['time'] for total in summary.values()) or 1
+
+        s = '\nphase               total_s   mean_ms  share  blocks'
+        for name, total in sorted(summary.items(), key=lambda item: item[1]['time'], reverse=True):
+            s += '\n%-18s %8.3f %9.3f %5.1f%% %7d' % (
+                name, total['time'], 1000 * total['mean_time'], 100 * total['time'] / total_time, total['blocks'])
+
+        if self.generations:
+            s += '\nlast sizes  ' + ' '.join('%s %s' % item for item in self.generations[-1]['sizes'].items())
+
+        s += '\n'
+        return s
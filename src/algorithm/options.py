@@ -1,4 +1,4 @@
-from .activations import sigmoid
+from .activations import sigmoid, get_activation, approximate
 
 
 class Options:
@@ -43,7 +43,19 @@ class Options:
         young_age_threshhold=10,
         young_age_fitness_bonus=1.3,
         old_age_threshold=50,
-        old_age_fitness_penalty=0.7
+        old_age_fitness_penalty=0.7,
+
+        innovation_history_limit=None,
+
+        array_genome=False,
+        vectorized_mutation=False,
+
+        plan_cache_size=1024,
+        compiled_predict=False,
+
+        approximate_activations=False,
+        activation_table_size=2048,
+        activation_table_range=10
     ):
         """Hyperparameters of the NEAT algorithm
 
@@ -53,7 +65,7 @@ class Options:
             population_size (int): Size of the population
             fitness_threshold (float): Maximum fitness required before terminating
             max_nodes (int, optional): Maximum number of nodes in the Brain. Defaults to float('inf').
-            activation_func (Callable[[float], float], optional): The activation function applied to every node. Defaults to sigmoid.
+            activation_func (Callable[[float], float] or str, optional): The activation function applied to every node, or its name in activations.ACTIVATIONS. Defaults to sigmoid.
             aggregation_func (Callable[[List[float]], float], optional): The aggregation of inputs in each node. Defaults to sum.
             excess_coeff (float, optional): Coefficient of the excess genes. Defaults to 1.
             disjoint_coeff (float, optional): Coefficient of the disjoint genes. Defaults to 1.
@@ -77,6 +89,14 @@ class Options:
             young_age_fitness_bonus (float, optional): The bonus in fitness given if a species is considered young. Defaults to 1.3.
             old_age_threshold (int, optional): A species is considered old if age is greater than this number. Defaults to 50.
             old_age_fitness_penalty (float, optional): The penalty given to a species if it is considered old. Defaults to 0.7.
+            innovation_history_limit (int, optional): If set the innovation table is compacted after every epoch, keeping only this many recent innovations plus the ones still used by the population. Defaults to None.
+            array_genome (bool, optional): If True the population stores its genomes in numpy arrays (ArrayBrain) instead of lists of gene objects. Defaults to False.
+            vectorized_mutation (bool, optional): If True the weights of all the children of a generation are mutated together with numpy instead of connection by connection. Defaults to False.
+            plan_cache_size (int, optional): Number of compiled evaluation plans kept in the process wide cache shared by the brains with the same topology. 0 disables the cache. Defaults to 1024.
+            compiled_predict (bool, optional): If True predict runs a straight-line Python function generated for the topology of the Brain instead of interpreting the evaluation plan. Defaults to False.
+            approximate_activations (bool, optional): If True sigmoid and tanh are read from interpolated lookup tables, see activations.ApproximateActivation. Outputs are no longer bit exact, Options.activation_func.max_error reports the error. On CPython with numpy the tables are slower than the exact functions, see the activation benchmarks. Defaults to False.
+            activation_table_size (int, optional): Number of intervals of the lookup tables. Defaults to 2048.
+            activation_table_range (float, optional): The lookup tables cover [-activation_table_range, activation_table_range], outside the output is clamped. Defaults to 10.
         """
         Options.num_inputs = num_inputs
         Options.num_outputs = num_outputs
@@ -85,7 +105,10 @@ class Options:
         Options.fitness_threshold = fitness_threshold
         Options.max_nodes = max_nodes
 
-        Options.activation_func = activation_func
+        Options.activation_func = get_activation(activation_func)
+        if approximate_activations:
+            Options.activation_func = approximate(Options.activation_func, activation_table_size, activation_table_range)
+
         Options.aggregation_func = aggregation_func
 
         Options.excess_coeff = excess_coeff
@@ -116,4 +139,36 @@ class Options:
         Options.young_age_threshhold = young_age_threshhold
         Options.young_age_fitness_bonus = young_age_fitness_bonus
         Options.old_age_threshold = old_age_threshold
-        Options.old_age_fitness_penalty = old_age_fitness_penalty
\ No newline at end of file
+        Options.old_age_fitness_penalty = old_age_fitness_penalty
+
+        Options.innovation_history_limit = innovation_history_limit
+
+        Options.array_genome = array_genome
+        Options.vectorized_mutation = vectorized_mutation
+
+        Options.plan_cache_size = plan_cache_size
+        Options.compiled_predict = compiled_predict
+
+        Options.approximate_activations = approximate_activations
+        Options.activation_table_size = activation_table_size
+        Options.activation_table_range = activation_table_range
+
+    @staticmethod
+    def get_options():
+        """Returns the current hyperparameters, so they can be sent to another process or saved
+
+        Returns:
+            dict: The hyperparameters set by set_options
+        """
+        return {key: value for key, value in vars(Options).items()
+                if not key.startswith('_') and not isinstance(value, staticmethod)}
+
+    @staticmethod
+    def load_options(options):
+        """Restores hyperparameters returned by get_options
+
+        Args:
+            options (dict): The hyperparameters
+        """
+        for key, value in options.items():
+            setattr(Options, key, value)
@@ -0,0 +1,75 @@
+import random
+
+import numpy
+
+from .options import Options
+
+
+def _evaluate_shard(eval_func, shard, options, seed):
+    """Runs the evaluation function on a shard of the pool inside a worker process
+
+    Args:
+        eval_func (Callable[[List[Brain]], None]): Function which sets the fitness of every brain
+        shard (List[Brain]): The brains of the shard
+        options (dict): Hyperparameters of the parent process
+        seed (int): Seed of the random generators of the worker
+
+    Returns:
+        List[float]: The fitness of every brain of the shard
+    """
+    Options.load_options(options)
+
+    random.seed(seed)
+    numpy.random.seed(seed)
+
+    eval_func(shard)
+
+    return [brain.fitness for brain in shard]
+
+
+def shard_pool(pool, num_shards):
+    """Splits the pool into contiguous shards of almost equal size
+
+    Args:
+        pool (List[Brain]): The pool
+        num_shards (int): Number of shards
+
+    Returns:
+        List[List[Brain]]: The non empty shards
+    """
+    size, extra = divmod(len(pool), num_shards)
+    shards = []
+    start = 0
+
+    for i in range(num_shards):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            shards.append(pool[start:end])
+        start = end
+
+    return shards
+
+
+def evaluate_parallel(executor, eval_func, pool, workers, seed):
+    """Evaluates the pool on a process pool and writes the fitness values back to the original brains
+
+    The pool is always split in the same shards and every shard gets its own seed, so the
+    results do not depend on which worker runs which shard.
+
+    Args:
+        executor (ProcessPoolExecutor): The process pool
+        eval_func (Callable[[List[Brain]], None]): Picklable function which sets the fitness of every brain it gets
+        pool (List[Brain]): The pool
+        workers (int): Number of shards
+        seed (int): Seed of this evaluation. Shard i is seeded with seed + i
+    """
+    options = Options.get_options()
+    shards = shard_pool(pool, workers)
+
+    futures = [executor.submit(_evaluate_shard, eval_func, shard, options, seed + i)
+               for i, shard in enumerate(shards)]
+
+    for shard, future in zip(shards, futures):
+        for brain, fitness in zip(shard, future.result()):
+            brain.fitness = fitness
+
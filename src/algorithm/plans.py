@@ -0,0 +1,279 @@
+from collections import OrderedDict, namedtuple
+from types import FunctionType
+
+from .genes import NodeState
+from .options import Options
+
+EvalPlan = namedtuple("EvalPlan", [
+    "inputs",
+    "bias",
+    "steps",
+    "outputs",
+    "sweeps",
+    "num_weights",
+    "function"
+])
+
+
+def live_nodes(nodes, connections):
+    """Returns the IDs of the nodes which can change the outputs
+
+    Inputs, bias and outputs are always live. A hidden node is dead if no enabled path leads
+    from it to an output. If the aggregation is sum and the activation of 0 is 0, a hidden node
+    which no enabled path from an input or the bias reaches always outputs 0, so it is dead too.
+
+    Args:
+        nodes (List[Node]): The nodes
+        connections (List[Connection]): The connections
+
+    Returns:
+        Set[int]: IDs of the live nodes
+    """
+    incoming = {node.id: [] for node in nodes}
+    outgoing = {node.id: [] for node in nodes}
+
+    for conn in connections:
+        if conn.enabled:
+            incoming[conn.to].append(conn.fr)
+            outgoing[conn.fr].append(conn.to)
+
+    fixed = set([node.id for node in nodes if node.state != NodeState.hidden])
+    sources = [node.id for node in nodes if node.state in (NodeState.input, NodeState.bias)]
+
+    def reached(start, edges):
+        seen = set(start)
+        stack = list(start)
+
+        while stack:
+            for node_id in edges[stack.pop()]:
+                if node_id not in seen:
+                    seen.add(node_id)
+                    stack.append(node_id)
+
+        return seen
+
+    live = reached([node.id for node in nodes if node.state == NodeState.output], incoming)
+
+    if Options.aggregation_func is sum and Options.activation_func(0) == 0:
+        live &= reached(sources, outgoing)
+
+    return live | fixed
+
+
+def compile_plan(nodes, connections):
+    """Builds the evaluation plan of a topology
+
+    The live nodes which are not inputs or bias are ordered topologically over the enabled
+    connections and each of them gets the list of its incoming (node index, weight index) pairs.
+    Dead nodes, see live_nodes, and their connections are left out.
+    The weight index points into the weights of the enabled connections in their list order,
+    so the plan holds no weights and is shared by every Brain with the same topology.
+    If the enabled connections contain a cycle the nodes are kept in their list order and
+    evaluated once per depth level, like a plain sweep.
+
+    An acyclic genome is fully propagated in one pass. The old sweep ran once per distinct
+    y level, which left hidden nodes at the end of a chain of nodes sharing a level, longer
+    than the number of levels, with stale values. Such genomes, evolved or saved, now
+    predict the feed-forward outputs, which can differ from what they predicted before.
+
+    Args:
+        nodes (List[Node]): The nodes, sorted by ID
+        connections (List[Connection]): The connections, sorted by innovation number
+
+    Returns:
+        EvalPlan: The evaluation plan
+    """
+    index = {node.id: i for i, node in enumerate(nodes)}
+
+    inputs = [i for i, node in enumerate(nodes) if node.state == NodeState.input]
+    bias = [i for i, node in enumerate(nodes) if node.state == NodeState.bias]
+    outputs = [i for i, node in enumerate(nodes) if node.state == NodeState.output]
+    live = live_nodes(nodes, connections)
+    computed = [i for i, node in enumerate(nodes)
+                if node.state in (NodeState.hidden, NodeState.output) and node.id in live]
+
+    incoming = {i: [] for i in computed}
+    outgoing = {i: [] for i in computed}
+    in_degree = {i: 0 for i in computed}
+
+    enabled = [conn for conn in connections if conn.enabled]
+
+    for w, conn in enumerate(enabled):
+        if conn.fr not in live or conn.to not in live:
+            continue
+
+        fr = index[conn.fr]
+        to = index[conn.to]
+        incoming[to].append((fr, w))
+
+        if fr in outgoing:
+            outgoing[fr].append(to)
+            in_degree[to] += 1
+
+    order = []
+    ready = [i for i in computed if in_degree[i] == 0]
+
+    while ready:
+        i = ready.pop(0)
+        order.append(i)
+
+        for to in outgoing[i]:
+            in_degree[to] -= 1
+            if in_degree[to] == 0:
+                ready.append(to)
+
+    if len(order) == len(computed):
+        sweeps = 1
+    else:
+        order = computed
+        sweeps = len(set([node.y for node in nodes]))
+
+    plan = EvalPlan(
+        inputs=inputs,
+        bias=bias,
+        steps=[(i, tuple(incoming[i])) for i in order],
+        outputs=outputs,
+        sweeps=sweeps,
+        num_weights=len(enabled),
+        function=None
+    )
+
+    if Options.compiled_predict:
+        plan = plan._replace(function=generate_function(plan))
+
+    return plan
+
+
+def generate_function(plan):
+    """Generates a straight-line Python function evaluating the plan
+
+    Every node becomes a local variable and every step one assignment, in topological order,
+    so there is no loop over the steps and no list indexing left. The weights are read from
+    the default value of the weights argument into locals, see bind_weights. With sum as
+    aggregation the sums are written out as additions. Cyclic plans repeat the steps once
+    per sweep, like the interpreter.
+
+    Args:
+        plan (EvalPlan): The evaluation plan
+
+    Returns:
+        Callable[[List[float], Tuple[float, ...]], List[float]]: The function, taking the inputs and the weights
+    """
+    used = set([w for _, incoming in plan.steps for _, w in incoming])
+    inline_sum = Options.aggregation_func is sum
+
+    lines = ['def predict(inputs, weights=()):']
+
+    if plan.num_weights:
+        lines.append('    %s, = weights' % ', '.join('w%d' % w if w in used else '_'
+                                                   for w in range(plan.num_weights)))
+
+    lines.append('    activation_func = Options.activation_func')
+    if not inline_sum:
+        lines.append('    aggregation_func = Options.aggregation_func')
+
+    for k, i in enumerate(plan.inputs):
+        lines.append('    v%d = inputs[%d]' % (i, k))
+    for i in plan.bias:
+        lines.append('    v%d = 1' % i)
+
+    indent = '    '
+    if plan.sweeps > 1:
+        lines.append('    %s = 0' % ' = '.join('v%d' % i for i, _ in plan.steps))
+        lines.append('    for _ in range(%d):' % plan.sweeps)
+        indent = '        '
+
+    for i, incoming in plan.steps:
+        terms = ['w%d * v%d' % (w, fr) for fr, w in incoming]
+
+        if inline_sum:
+            total = ' + '.join(terms) or '0'
+        else:
+            total = 'aggregation_func([%s])' % ', '.join(terms)
+
+        lines.append('%sv%d = activation_func(%s)' % (indent, i, total))
+
+    lines.append('    return [%s]' % ', '.join('v%d' % i for i in plan.outputs))
+
+    namespace = {'Options': Options}
+    exec(compile('\n'.join(lines), '<plan>', 'exec'), namespace)
+
+    return namespace['predict']
+
+
+def bind_weights(function, weights):
+    """Returns a copy of a generated function with the given weights baked in as its default weights
+
+    Args:
+        function (Callable): Function returned by generate_function
+        weights (List[float]): The weights of the enabled connections
+
+    Returns:
+        Callable[[List[float]], List[float]]: The function, taking only the inputs
+    """
+    return FunctionType(function.__code__, function.__globals__, function.__name__, (tuple(weights),))
+
+
+class PlanCache:
+    def __init__(self):
+        """Process wide LRU cache of evaluation plans keyed by the structural key of a topology
+
+        Elitism, copies and low structural mutation rates make most brains of a generation
+        share their topology, so they share one compiled plan and only keep their own weights.
+        The size is read from Options.plan_cache_size.
+
+        Contains:
+            plans (OrderedDict[tuple, EvalPlan]): The plans, least recently used first
+            hits (int): Number of lookups which found a plan
+            misses (int): Number of lookups which compiled a plan
+            functions (tuple): Activation, aggregation and compiled_predict options the plans were compiled with
+        """
+        self.plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.functions = None
+
+    def __len__(self):
+        return len(self.plans)
+
+    def get(self, key, nodes, connections):
+        """Returns the plan of a topology, compiling it on a miss
+
+        Args:
+            key (tuple): Structural key of the topology, see Brain._topology_key
+            nodes (List[Node]): The nodes of the Brain
+            connections (List[Connection]): The connections of the Brain
+
+        Returns:
+            EvalPlan: The evaluation plan
+        """
+        functions = (Options.activation_func, Options.aggregation_func, Options.compiled_predict)
+        if functions != self.functions:
+            # the pruning and the generated code depend on these options
+            self.plans.clear()
+            self.functions = functions
+
+        plan = self.plans.get(key)
+
+        if plan is not None:
+            self.plans.move_to_end(key)
+            self.hits += 1
+            return plan
+
+        self.misses += 1
+        plan = compile_plan(nodes, connections)
+
+        if Options.plan_cache_size:
+            self.plans[key] = plan
+            while len(self.plans) > Options.plan_cache_size:
+                self.plans.popitem(last=False)
+
+        return plan
+
+    def clear(self):
+        self.plans.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+plan_cache = PlanCache()
@@ -1,14 +1,23 @@
-import copy
 import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import numpy
 
 from .brain import Brain
+from .checkpoint import save_checkpoint, restore_checkpoint
+from .genome import ArrayBrain
+from .innovation import InnovTable
+from .mutation import mutate_weights
+from .parallel import evaluate_parallel
 from .species import Species
 from .options import Options
 
 
 class Population:
     def __init__(self):
-        self.pool = [Brain(i) for i in range(Options.population_size)]
+        self.brain_class = ArrayBrain if Options.array_genome else Brain
+        self.pool = [self.brain_class(i) for i in range(Options.population_size)]
         self.species = []
 
         self.best = self.pool[0]
@@ -17,11 +26,71 @@ class Population:
         self.brain_id = len(self.pool)
         self.species_id = 0   
 
-    def evaluate(self, eval_func, num_generations=float('inf'), report=True):
+        self.metrics = None
+        self.rng = None
+        # state of the caller, like the clock of a world, saved and resumed with the checkpoints
+        self.extra = {}
+
+    @staticmethod
+    def from_checkpoint(file_name):
+        """Resumes a population saved with save_checkpoint
+
+        Args:
+            file_name (str): Path of the checkpoint
+
+        Returns:
+            Population: The population, with Options, the innovation table and the random generators restored
+        """
+        population = Population.__new__(Population)
+        restore_checkpoint(population, file_name)
+
+        return population
+
+    def save_checkpoint(self, file_name):
+        """Saves the population with everything needed to resume it, see checkpoint.save_checkpoint
+
+        Args:
+            file_name (str): Path of the checkpoint
+        """
+        save_checkpoint(self, file_name)
+
+    def evaluate(self, eval_func, num_generations=float('inf'), report=True, workers=None, seed=None,
+                 checkpoint=None):
+        """Evaluates and evolves the population until the fitness threshold or the number of generations is reached
+
+        Args:
+            eval_func (Callable[[List[Brain]], None]): Function which sets the fitness of every brain it gets
+            num_generations (int, optional): Maximum number of generations. Defaults to float('inf').
+            report (bool, optional): Print the population after every epoch. Defaults to True.
+            workers (int, optional): If set the pool is sharded across this many processes. eval_func must be picklable. Defaults to None.
+            seed (int, optional): Seed of the workers, generation g is seeded with seed + g * workers. Defaults to a random seed.
+            checkpoint (str, optional): If set the population is checkpointed to this file after every epoch. Defaults to None.
+
+        Returns:
+            Tuple[Brain, bool]: The best brain and whether it reached the fitness threshold
+        """
+        if not workers:
+            return self._evaluate(eval_func, num_generations, report, checkpoint)
+
+        if seed is None:
+            seed = random.getrandbits(32)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return self._evaluate(
+                lambda pool: evaluate_parallel(executor, eval_func, pool, workers, seed + self.gen * workers),
+                num_generations,
+                report,
+                checkpoint
+            )
+
+    def _evaluate(self, eval_func, num_generations, report, checkpoint=None):
         while True:
             eval_func(self.pool)
             self.epoch()
 
+            if checkpoint is not None:
+                self.save_checkpoint(checkpoint)
+
             if report:
                 print(self)
 
@@ -31,10 +100,19 @@ class Population:
                 return self.best, False
 
     def _speciate(self):
-        for brain in self.pool:
+        representatives = [sp.best for sp in self.species]
+        distances = Species.compat_dist_matrix(self.pool, representatives) if representatives else None
+
+        for row, brain in enumerate(self.pool):
             added = False
 
-            for sp in self.species:
+            if distances is not None:
+                matches = numpy.flatnonzero(distances[row] <= Options.compatibility_threshold)
+                if len(matches):
+                    self.species[matches[0]].pool.append(brain)
+                    continue
+
+            for sp in self.species[len(representatives):]:
                 if sp.same_species(brain):
                     sp.pool.append(brain)
                     added = True
@@ -53,6 +131,7 @@ class Population:
 
     def _reproduce(self):
         new_pop = []
+        children = []
         for s in self.species:
             new_pool = []
 
@@ -67,18 +146,28 @@ class Population:
                     child = self.crossover(brain1, brain2, self.brain_id)
                     self.brain_id += 1
                 else:
-                    child = copy.copy(brain1)
+                    child = brain1.copy()
+
+                if Options.vectorized_mutation:
+                    child._mutate_structure()
+                    children.append(child)
+                else:
+                    child.mutate()
 
-                child.mutate()
                 new_pool.append(child)
 
             new_pop.extend(new_pool)
             s.purge()
 
+        if children:
+            if self.rng is None:
+                self.rng = numpy.random.default_rng(random.getrandbits(64))
+            mutate_weights(children, self.rng)
+
         self.pool = new_pop
 
         while len(self.pool) < Options.population_size:
-            self.pool.append(Brain(self.brain_id))
+            self.pool.append(self.brain_class(self.brain_id))
             self.brain_id += 1
 
     def _sort_pool(self):
@@ -116,20 +205,67 @@ class Population:
         self.species = new_species
 
     def epoch(self):
-        self._sort_pool()
-        self._speciate()
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.start_generation(self.gen)
+            innov = InnovTable.innov
+
+        with self._phase('sort_pool'):
+            self._sort_pool()
+
+        with self._phase('speciate'):
+            self._speciate()
+
+        if metrics is not None:
+            metrics.record('species', len(self.species))
 
         if Options.dynamic_compatibility_threshold:
             self._change_compatibility_threshold()
 
-        self._adjust_fitnesses()
-        self._calc_spawns()
-        
-        self._reset_and_kill()
-        self._reproduce()        
+        with self._phase('adjust_fitnesses'):
+            self._adjust_fitnesses()
+
+        with self._phase('calc_spawns'):
+            self._calc_spawns()
+
+        with self._phase('reset_and_kill'):
+            self._reset_and_kill()
+
+        if metrics is not None:
+            metrics.record('surviving_species', len(self.species))
+
+        with self._phase('reproduce'):
+            self._reproduce()
+
+        if Options.innovation_history_limit is not None:
+            with self._phase('compact_innovations'):
+                InnovTable.compact(self.pool, Options.innovation_history_limit)
 
         self.gen += 1
 
+        if metrics is not None:
+            metrics.record('pool', len(self.pool))
+            metrics.record('nodes', sum(len(brain.nodes) for brain in self.pool))
+            metrics.record('genes', sum(len(brain.connections) for brain in self.pool))
+            metrics.record('innovations_added', InnovTable.innov - innov)
+            metrics.record('innovation_history', len(InnovTable.history))
+            metrics.record('compatibility_threshold', Options.compatibility_threshold)
+            metrics.end_generation()
+
+    def _phase(self, name):
+        """Measures a phase of the epoch when metrics are collected
+
+        Args:
+            name (str): Name of the phase
+
+        Returns:
+            ContextManager: metrics.phase(name), or a context doing nothing without metrics
+        """
+        if self.metrics is None:
+            return nullcontext()
+
+        return self.metrics.phase(name)
+
     @staticmethod
     def crossover(mum, dad, baby_id=None):
         n_mum = len(mum.connections)
@@ -152,6 +288,8 @@ class Population:
 
         i_mum = i_dad = 0
         node_ids = set()
+        # local lookups, the lookup tables of the parents would outlive the crossover
+        parent_nodes = [{node.id: node for node in parent.nodes} for parent in (mum, dad)]
 
         while i_mum < n_mum or i_dad < n_dad:
             mum_gene = mum.connections[i_mum] if i_mum < n_mum else None
@@ -192,30 +330,30 @@ class Population:
                 i_mum += 1
 
             if selected_gene is not None and selected_genome is not None:
-                baby_connections.append(copy.copy(selected_gene))
+                baby_connections.append(selected_gene.copy())
 
                 if not selected_gene.fr in node_ids:
-                    node = selected_genome._get_node(selected_gene.fr)
+                    node = parent_nodes[selected_genome is dad].get(selected_gene.fr)
                     if node != None:
-                        baby_nodes.append(copy.copy(node))
+                        baby_nodes.append(node.copy())
                         node_ids.add(selected_gene.fr)
 
                 if not selected_gene.to in node_ids:
-                    node = selected_genome._get_node(selected_gene.to)
+                    node = parent_nodes[selected_genome is dad].get(selected_gene.to)
                     if node != None:
-                        baby_nodes.append(copy.copy(node))
+                        baby_nodes.append(node.copy())
                         node_ids.add(selected_gene.to)
 
         for node in mum.nodes:
             if not node.id in node_ids:
-                baby_nodes.append(copy.copy(node))
+                baby_nodes.append(node.copy())
                 node_ids.add(node.id)
 
         s = list(set([l.enabled for l in baby_connections]))
         if len(s) == 1 and not s[0]:
             random.choice(baby_connections).enabled = True
 
-        return Brain(baby_id, baby_nodes, baby_connections)
+        return type(mum)(baby_id, baby_nodes, baby_connections)
 
     def __str__(self):
         b = self.best
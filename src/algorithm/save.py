@@ -24,7 +24,10 @@ def _save_conn(conn):
     }
 
 
-def save_brain(brain, file_name=None):
+def save_brain(brain, file_name=None, phenotype=False):
+    if phenotype:
+        brain = brain.phenotype()
+
     data = json.dumps(
         {
             'id': brain.id,
@@ -52,18 +55,22 @@ def _load_node(node):
 
 
 def _load_conn(conn):
-    return Connection(
+    connection = Connection(
         conn['fr'],
         conn['to'],
         conn['innov'],
         conn['weight']
     )
+    connection.weight = conn['weight']
+    connection.enabled = conn.get('enabled', True)
+
+    return connection
 
 
-def load_brain(file_name):
+def load_brain(file_name, brain_class=Brain):
     data = json.load(open(file_name))
 
-    return Brain(
+    return brain_class(
         data['id'],
         [_load_node(node) for node in data['nodes']],
         [_load_conn(conn) for conn in data['connections']],
@@ -1,6 +1,8 @@
 from .options import Options
 import random
 
+import numpy
+
 class Species:
     def __init__(self, species_id, member):
         self.best = member
@@ -102,5 +104,112 @@ class Species:
         n_match += 1
         return (Options.excess_coeff * n_excess + Options.disjoint_coeff * n_disjoint) / max(n_g1, n_g2) + Options.weight_coeff * weight_difference / n_match
 
+    @staticmethod
+    def compat_dist_matrix(genomes1, genomes2, chunk_size=1 << 22):
+        """Compatibility distance from every genome of genomes1 to every genome of genomes2
+
+        The connections are scattered into dense (genome, innovation) matrices so the matches,
+        excess and disjoint genes of all the pairs are counted at once. The weight differences
+        are accumulated in innovation order, so the result is identical to compat_dist. Genomes
+        whose connections are not sorted by innovation fall back to compat_dist.
+
+        Args:
+            genomes1 (List[Brain]): Genomes of the rows
+            genomes2 (List[Brain]): Genomes of the columns
+            chunk_size (int, optional): Maximum number of (pair, innovation) cells computed at once. Defaults to 1 << 22.
+
+        Returns:
+            numpy.ndarray: Matrix of shape (len(genomes1), len(genomes2)) with the distances
+        """
+        genes1 = [Species._innovs_and_weights(genome) for genome in genomes1]
+        genes2 = [Species._innovs_and_weights(genome) for genome in genomes2]
+
+        innovs = numpy.unique(numpy.concatenate([innov for innov, _ in genes1 + genes2] + [numpy.zeros(0, dtype=int)]))
+
+        present1, weights1, counts1, cumulative1, last1 = Species._scatter(genes1, innovs)
+        present2, weights2, counts2, cumulative2, last2 = Species._scatter(genes2, innovs)
+
+        n_match = numpy.zeros((len(genomes1), len(genomes2)), dtype=int)
+        weight_difference = numpy.zeros((len(genomes1), len(genomes2)))
+        step = max(1, chunk_size // max(1, len(genomes2) * len(innovs)))
+
+        for start in range(0, len(genomes1), step):
+            end = start + step
+            match = present1[start:end, None, :] & present2[None, :, :]
+            n_match[start:end] = match.sum(axis=2)
+
+            difference = numpy.abs(weights1[start:end, None, :] - weights2[None, :, :]) * match
+            if len(innovs):
+                weight_difference[start:end] = numpy.cumsum(difference, axis=2)[:, :, -1]
+
+        cols = numpy.arange(len(genomes2))[None, :]
+        rows = numpy.arange(len(genomes1))[:, None]
+        n_excess = (counts1[:, None] - cumulative1[rows, last2[None, :]]) + \
+                   (counts2[None, :] - cumulative2[cols, last1[:, None]])
+        n_disjoint = counts1[:, None] + counts2[None, :] - 2 * n_match - n_excess
+
+        distances = (Options.excess_coeff * n_excess + Options.disjoint_coeff * n_disjoint) / \
+            numpy.maximum(counts1[:, None], counts2[None, :]) + \
+            Options.weight_coeff * weight_difference / (n_match + 1)
+
+        unsorted1 = [i for i, (innov, _) in enumerate(genes1) if numpy.any(numpy.diff(innov) <= 0)]
+        unsorted2 = [j for j, (innov, _) in enumerate(genes2) if numpy.any(numpy.diff(innov) <= 0)]
+
+        for i in unsorted1:
+            for j in range(len(genomes2)):
+                distances[i, j] = Species.compat_dist(genomes1[i], genomes2[j])
+
+        for j in unsorted2:
+            for i in range(len(genomes1)):
+                distances[i, j] = Species.compat_dist(genomes1[i], genomes2[j])
+
+        return distances
+
+    @staticmethod
+    def _innovs_and_weights(genome):
+        """Innovation numbers and weights of the connections of a genome, in genome order
+
+        Args:
+            genome (Brain): The genome
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: The innovation numbers and the weights
+        """
+        data = getattr(genome.connections, 'data', None)
+        if data is not None:
+            return data['innov'].astype(int), data['weight'].astype(float)
+
+        return (numpy.array([conn.innov for conn in genome.connections], dtype=int),
+                numpy.array([conn.weight for conn in genome.connections], dtype=float))
+
+    @staticmethod
+    def _scatter(genes, innovs):
+        """Scatters the connections of many genomes into dense matrices indexed by innovation
+
+        Args:
+            genes (List[Tuple[numpy.ndarray, numpy.ndarray]]): Innovation numbers and weights of every genome
+            innovs (numpy.ndarray): Sorted innovation numbers of all the columns
+
+        Returns:
+            Tuple: presence and weight matrices, number of connections, cumulative number of connections
+            up to every column (shifted by one column) and the column after the last connection of every genome
+        """
+        present = numpy.zeros((len(genes), len(innovs)), dtype=bool)
+        weights = numpy.zeros((len(genes), len(innovs)))
+        counts = numpy.zeros(len(genes), dtype=int)
+        last = numpy.zeros(len(genes), dtype=int)
+
+        for row, (innov, weight) in enumerate(genes):
+            cols = numpy.searchsorted(innovs, innov)
+            present[row, cols] = True
+            weights[row, cols] = weight
+            counts[row] = len(innov)
+            last[row] = cols.max() + 1 if len(cols) else 0
+
+        cumulative = numpy.zeros((len(genes), len(innovs) + 1), dtype=int)
+        numpy.cumsum(present, axis=1, out=cumulative[:, 1:])
+
+        return present, weights, counts, cumulative, last
+
     def same_species(self, brain):
         return Species.compat_dist(brain, self.best) <= Options.compatibility_threshold
@@ -0,0 +1,107 @@
+import numpy
+
+
+def linear(x):
+    """Linear activation function over numpy arrays
+
+    Args:
+        x (numpy.ndarray): input values
+
+    Returns:
+        numpy.ndarray: output values
+    """
+    return numpy.asarray(x, dtype=float)
+
+
+def sigmoid(x):
+    """Sigmoid activation function over numpy arrays
+    exp overflows to inf for very negative inputs, which gives 0 like the scalar form
+
+    Args:
+        x (numpy.ndarray): input values
+
+    Returns:
+        numpy.ndarray: output values
+    """
+    with numpy.errstate(over='ignore'):
+        return 1.0 / (1.0 + numpy.exp(-numpy.asarray(x, dtype=float)))
+
+
+def clamped(x):
+    """Clamped activation function over numpy arrays
+
+    Args:
+        x (numpy.ndarray): input values
+
+    Returns:
+        numpy.ndarray: output values
+    """
+    return numpy.clip(numpy.asarray(x, dtype=float), -1, 1)
+
+
+def relu(x):
+    """ReLu activation function over numpy arrays
+
+    Args:
+        x (numpy.ndarray): input values
+
+    Returns:
+        numpy.ndarray: output values
+    """
+    return numpy.maximum(numpy.asarray(x, dtype=float), 0)
+
+
+def lelu(x):
+    """LeLu activation function over numpy arrays
+
+    Args:
+        x (numpy.ndarray): input values
+
+    Returns:
+        numpy.ndarray: output values
+    """
+    x = numpy.asarray(x, dtype=float)
+    return numpy.where(x < 0, 0.01 * x, x)
+
+
+def softplus(x):
+    """Softplus activation function over numpy arrays
+    Where exp overflows the output is 1, like the scalar form
+
+    Args:
+        x (numpy.ndarray): input values
+
+    Returns:
+        numpy.ndarray: output values
+    """
+    x = numpy.asarray(x, dtype=float)
+
+    with numpy.errstate(over='ignore'):
+        e = numpy.exp(x)
+
+    return numpy.where(numpy.isinf(e) & numpy.isfinite(x), 1.0, numpy.log(1 + e))
+
+
+def step(x):
+    """Binary step activation function over numpy arrays
+
+    Args:
+        x (numpy.ndarray): input values
+
+    Returns:
+        numpy.ndarray: output values
+    """
+    return numpy.where(numpy.asarray(x) < 0, 0.0, 1.0)
+
+
+def tanh(x):
+    """Tanh activation function over numpy arrays
+
+    Args:
+        x (numpy.ndarray): input values
+
+    Returns:
+        numpy.ndarray: output values
+    """
+    with numpy.errstate(over='ignore'):
+        return 2 * sigmoid(2 * numpy.asarray(x, dtype=float)) - 1
@@ -0,0 +1,81 @@
+"""
+Benchmarks of the NEAT core and of the world step.
+
+Run from the src directory:
+    python -m benchmarks run [-o results.json] [-k filter]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.1]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from . import activations, genes, neat, world
+from .core import BENCHMARKS, measure, compare
+
+
+def run(args):
+    results = {}
+
+    for name, setup in BENCHMARKS.items():
+        if args.filter and args.filter not in name:
+            continue
+
+        result = measure(setup, min_time=args.min_time)
+        results[name] = result
+        line = f"{name:45} {result['ops_per_sec']:12.1f} ops/s {result['peak_bytes'] / 1024:10.1f} KiB peak"
+        if 'bytes_per_item' in result:
+            line += f" {result['bytes_per_item']:8.1f} B/item"
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'date': str(datetime.now()),
+                'python': platform.python_version(),
+                'results': results
+            }, file, indent=4)
+
+
+def compare_files(args):
+    baseline = json.load(open(args.baseline))['results']
+    current = json.load(open(args.current))['results']
+
+    regressions = 0
+    for name, speed, memory, regression in compare(baseline, current, args.threshold):
+        regressions += regression
+        flag = 'REGRESSION' if regression else ''
+        print(f"{name:45} speed x{speed:6.2f} memory x{memory:6.2f} {flag}")
+
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run the benchmarks')
+    run_parser.add_argument('-o', '--output', help='Write the results to this JSON file')
+    run_parser.add_argument('-k', '--filter', help='Only run benchmarks whose name contains this string')
+    run_parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds timed per benchmark')
+
+    compare_parser = commands.add_parser('compare', help='Flag regressions against a baseline')
+    compare_parser.add_argument('baseline', help='Stored baseline JSON file')
+    compare_parser.add_argument('current', help='New results JSON file')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='Tolerated relative change')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        run(args)
+        return 0
+
+    return compare_files(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import random
+
+import numpy
+
+from algorithm.activations import get_activation, sigmoid, tanh
+from algorithm.batch import predict_batch
+from algorithm.options import Options
+
+from .core import benchmark
+from .neat import grown_brain
+
+SAMPLES = 10000
+
+
+def _setup(func, approximate, population_size=20):
+    random.seed(0)
+    Options.set_options(1, 2, population_size, activation_func=func, approximate_activations=approximate)
+
+
+def _scalar(func, approximate):
+    def setup():
+        _setup(func, approximate)
+        activation_func = Options.activation_func
+        xs = numpy.random.RandomState(0).uniform(-5, 5, SAMPLES).tolist()
+
+        def op():
+            for x in xs:
+                activation_func(x)
+
+        return op
+
+    return setup
+
+
+def _vector(func, approximate):
+    def setup():
+        _setup(func, approximate)
+        activation_func = get_activation(Options.activation_func, vectorized=True)
+        xs = numpy.random.RandomState(0).uniform(-5, 5, SAMPLES)
+
+        return lambda: activation_func(xs)
+
+    return setup
+
+
+def _predict_batch(approximate, pool_size=2000):
+    def setup():
+        _setup(tanh, approximate, pool_size)
+        # cyclic brains fall back to Brain.predict, keep the acyclic ones
+        brains = [brain for brain in (grown_brain(10, genome_id) for genome_id in range(100))
+                  if brain._build_plan().sweeps == 1][:20]
+        pool = [brains[i % len(brains)].copy() for i in range(pool_size)]
+        inputs = numpy.random.RandomState(0).uniform(-1, 1, (pool_size, 1))
+
+        return lambda: predict_batch(pool, inputs)
+
+    return setup
+
+
+for _func in (sigmoid, tanh):
+    for _approximate in (False, True):
+        _mode = ',approximate' if _approximate else ''
+        benchmark(f'activation.{_func.__name__}[scalar x{SAMPLES}{_mode}]')(_scalar(_func, _approximate))
+        benchmark(f'activation.{_func.__name__}[vector x{SAMPLES}{_mode}]')(_vector(_func, _approximate))
+
+benchmark('predict_batch[pool=2000,tanh]')(_predict_batch(False))
+benchmark('predict_batch[pool=2000,tanh,approximate]')(_predict_batch(True))
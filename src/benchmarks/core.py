@@ -0,0 +1,116 @@
+import gc
+import time
+import tracemalloc
+
+from algorithm.innovation import InnovTable
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registers a benchmark
+
+    The decorated function does the setup and returns the operation to measure,
+    a callable without arguments. If the operation has an items attribute the
+    peak memory is also reported per item. If it has a reset attribute, a callable
+    without arguments, it is called before every run, outside of the timing, so an
+    operation changing its state is always measured from the same state.
+
+    Args:
+        name (str): Unique name of the benchmark
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def reset_innovations():
+    """Empties the global innovation table so every benchmark starts from the same state
+    """
+    InnovTable.history = []
+    InnovTable.index = {}
+    InnovTable.innov = 0
+    InnovTable.node_id = 0
+
+
+def measure(setup, min_time=0.2, max_runs=100000):
+    """Measures the throughput and the peak memory of a benchmark
+
+    Args:
+        setup (Callable[[], Callable[[], None]]): The registered benchmark
+        min_time (float, optional): Minimum seconds spent timing the operation. Defaults to 0.2.
+        max_runs (int, optional): Maximum number of timed runs. Defaults to 100000.
+
+    Returns:
+        dict: ops_per_sec, runs, peak_bytes and, for operations with items, bytes_per_item
+    """
+    reset_innovations()
+    op = setup()
+    reset = getattr(op, 'reset', None)
+
+    if reset:
+        reset()
+    gc.collect()
+    tracemalloc.start()
+    op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    runs = 0
+    elapsed = 0.0
+
+    if reset:
+        while elapsed < min_time and runs < max_runs:
+            reset()
+            start = time.perf_counter()
+            op()
+            elapsed += time.perf_counter() - start
+            runs += 1
+    else:
+        start = time.perf_counter()
+
+        while elapsed < min_time and runs < max_runs:
+            op()
+            runs += 1
+            elapsed = time.perf_counter() - start
+
+    result = {
+        'ops_per_sec': runs / elapsed,
+        'runs': runs,
+        'peak_bytes': peak
+    }
+
+    items = getattr(op, 'items', None)
+    if items:
+        result['bytes_per_item'] = peak / items
+
+    return result
+
+
+def compare(baseline, current, threshold=0.1):
+    """Compares two benchmark results
+
+    Args:
+        baseline (dict): The stored results
+        current (dict): The new results
+        threshold (float, optional): Relative change tolerated before flagging a regression. Defaults to 0.1.
+
+    Returns:
+        List[Tuple[str, float, float, bool]]: Name, throughput ratio, memory ratio and regression flag of every common benchmark
+    """
+    rows = []
+
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        speed = result['ops_per_sec'] / base['ops_per_sec']
+        memory = result['peak_bytes'] / base['peak_bytes'] if base['peak_bytes'] else 1.0
+        regression = speed < 1 - threshold or memory > 1 + threshold
+
+        rows.append((name, speed, memory, regression))
+
+    return rows
@@ -0,0 +1,62 @@
+import random
+
+from algorithm.genes import NodeState, Node, Connection
+from algorithm.innovation import Innovation
+
+from .core import benchmark
+
+NUM_GENES = 10000
+
+
+class DictNode:
+    """Node gene laid out like before __slots__, for the per gene memory comparison
+    """
+
+    def __init__(self, node_id, state, x, y):
+        self.id = node_id
+        self.state = state
+        self.x = x
+        self.y = y
+        self.val = 0
+
+
+class DictConnection:
+    """Connection gene laid out like before __slots__
+    """
+
+    def __init__(self, fr, to, innov, weight=None):
+        self.fr = fr
+        self.to = to
+        self.weight = weight or random.uniform(-1, 1)
+        self.enabled = True
+        self.innov = innov
+
+
+class DictInnovation:
+    """Innovation laid out like before __slots__
+    """
+
+    def __init__(self, innov, new_conn, fr=None, to=None, node_id=None):
+        self.innov = innov
+        self.new_conn = new_conn
+        self.fr = fr
+        self.to = to
+        self.node_id = node_id
+
+
+def _genes(factory):
+    def setup():
+        def op():
+            op.genes = [factory(i) for i in range(NUM_GENES)]
+
+        op.items = NUM_GENES
+        return op
+
+    return setup
+
+
+for _name, _node, _conn, _innov in [('slots', Node, Connection, Innovation),
+                                    ('dict', DictNode, DictConnection, DictInnovation)]:
+    benchmark(f'genes.node[{_name}]')(_genes(lambda i, cls=_node: cls(i, NodeState.hidden, 0.5, float(i))))
+    benchmark(f'genes.connection[{_name}]')(_genes(lambda i, cls=_conn: cls(i, i + 1, i)))
+    benchmark(f'genes.innovation[{_name}]')(_genes(lambda i, cls=_innov: cls(i, True, i, i + 1)))
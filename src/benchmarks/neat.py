@@ -0,0 +1,150 @@
+import copy
+import io
+import random
+from contextlib import redirect_stdout
+
+from algorithm.activations import tanh
+from algorithm.brain import Brain
+from algorithm.innovation import InnovTable
+from algorithm.options import Options
+from algorithm.plans import plan_cache
+from algorithm.population import Population
+from algorithm.species import Species
+
+from .core import benchmark
+
+GENOME_SIZES = [0, 10, 50]
+POPULATION_SIZES = [20, 200, 2000]
+
+
+def grown_brain(hidden_nodes, genome_id=0):
+    """Builds a Brain with the given number of hidden nodes and some extra connections
+
+    Args:
+        hidden_nodes (int): Number of hidden nodes to add
+        genome_id (int, optional): ID of the Brain. Defaults to 0.
+
+    Returns:
+        Brain: The Brain
+    """
+    brain = Brain(genome_id)
+
+    while len(brain.nodes) < Options.num_inputs + Options.num_outputs + 1 + hidden_nodes:
+        brain._add_node()
+        brain._add_conn()
+
+    return brain
+
+
+def _setup(population_size=20):
+    random.seed(0)
+    Options.set_options(1, 2, population_size, activation_func=tanh)
+
+
+def _predict(hidden_nodes, compiled=False):
+    def setup():
+        _setup()
+        Options.compiled_predict = compiled
+        brain = grown_brain(hidden_nodes)
+        return lambda: brain.predict([0.5])
+
+    return setup
+
+
+def _epoch(population_size, generations=5):
+    def setup():
+        _setup(population_size)
+        population = Population()
+
+        with redirect_stdout(io.StringIO()):
+            for _ in range(generations):
+                for brain in population.pool:
+                    brain.fitness = random.random()
+                population.epoch()
+
+        for brain in population.pool:
+            brain.fitness = random.random()
+
+        # every run starts from this evolved state, or the genomes and the innovations would
+        # keep growing and the result would depend on the number of runs
+        snapshot = copy.deepcopy((population, InnovTable.history, InnovTable.index,
+                                  InnovTable.innov, InnovTable.node_id, Options.compatibility_threshold))
+        state = {}
+
+        def reset():
+            (state['population'], InnovTable.history, InnovTable.index,
+             InnovTable.innov, InnovTable.node_id, Options.compatibility_threshold) = copy.deepcopy(snapshot)
+            random.seed(0)
+
+        def op():
+            with redirect_stdout(io.StringIO()):
+                state['population'].epoch()
+
+        op.reset = reset
+        return op
+
+    return setup
+
+
+for _hidden in GENOME_SIZES:
+    benchmark(f'brain.predict[hidden={_hidden}]')(_predict(_hidden))
+    benchmark(f'brain.predict[hidden={_hidden},compiled]')(_predict(_hidden, compiled=True))
+
+for _size in POPULATION_SIZES:
+    benchmark(f'population.epoch[pool={_size}]')(_epoch(_size))
+
+
+@benchmark('brain.mutate[copy+mutate]')
+def mutate():
+    _setup()
+    brain = grown_brain(10)
+    return lambda: copy.copy(brain).mutate()
+
+
+@benchmark('brain._add_conn[copy+add]')
+def add_conn():
+    _setup()
+    brain = grown_brain(10)
+    return lambda: copy.copy(brain)._add_conn()
+
+
+@benchmark('population.crossover')
+def crossover():
+    _setup()
+    mum = grown_brain(10, 0)
+    dad = grown_brain(10, 1)
+    mum.fitness = 1
+    return lambda: Population.crossover(mum, dad, 2)
+
+
+@benchmark('species.compat_dist')
+def compat_dist():
+    _setup()
+    brain1 = grown_brain(10, 0)
+    brain2 = grown_brain(10, 1)
+    return lambda: Species.compat_dist(brain1, brain2)
+
+
+@benchmark('brain._build_plan[pool=200]')
+def build_plans():
+    _setup()
+    parents = [grown_brain(10, genome_id) for genome_id in range(10)]
+    brains = []
+
+    for genome_id in range(200):
+        # like a generation: mostly copies with new weights, a few structural mutations
+        brain = copy.copy(parents[genome_id % len(parents)])
+        brain.id = genome_id
+        if genome_id % 20 == 0:
+            brain._add_conn()
+        brain._mutate_weights()
+        brains.append(brain)
+
+    def op():
+        plan_cache.clear()
+        for brain in brains:
+            brain._invalidate_plan()
+            brain._build_plan()
+            brain._build_weights()
+
+    return op
@@ -0,0 +1,67 @@
+import io
+import random
+from contextlib import redirect_stdout
+
+from .core import benchmark
+
+WORLD_SIZES = [(20, 20), (200, 400)]
+
+
+def _tick(num_cells, num_foods):
+    def setup():
+        from world.simulation import Simulation
+
+        random.seed(0)
+        with redirect_stdout(io.StringIO()):
+            simulation = Simulation(food_num=num_foods, population_size=num_cells)
+
+        def op():
+            with redirect_stdout(io.StringIO()):
+                simulation.step()
+
+        return op
+
+    return setup
+
+
+for _cells, _foods in WORLD_SIZES:
+    benchmark(f'world.tick[cells={_cells},foods={_foods}]')(_tick(_cells, _foods))
+
+
+def _state_step(num_cells):
+    def setup():
+        import numpy
+        from world.state import WorldState
+
+        numpy.random.seed(0)
+        state = WorldState(num_cells)
+        for _ in range(num_cells):
+            state.add(*numpy.random.uniform(0, 720, 3), speed=30, health=100)
+        rows = list(range(num_cells))
+        decisions = numpy.random.uniform(-1, 1, (num_cells, 2))
+
+        return lambda: state.step(rows, decisions)
+
+    return setup
+
+
+for _cells in [20, 400, 5000]:
+    benchmark(f'world.state.step[cells={_cells}]')(_state_step(_cells))
+
+
+def _perceive(num_cells, num_foods):
+    def setup():
+        import numpy
+        from world.perception import perceive
+
+        numpy.random.seed(0)
+        cells = numpy.random.uniform(0, 720, (3, num_cells))
+        foods = numpy.random.uniform(0, 720, (2, num_foods))
+
+        return lambda: perceive(*cells, *foods, 200)
+
+    return setup
+
+
+for _cells, _foods in WORLD_SIZES:
+    benchmark(f'world.perceive[cells={_cells},foods={_foods}]')(_perceive(_cells, _foods))
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+
+import pygame
+
+from commons.settings import font as default_font
+
+
+class AssetCache:
+    """
+    Surfaces shared by every entity, built once instead of every generation or every frame:
+    images loaded and scaled once per size, text surfaces memoized by string and colour
+    with LRU eviction, and ring sprites, like the vision circles, pre-rendered per radius.
+    """
+
+    def __init__(self, max_texts=2048):
+        self.max_texts = max_texts
+        self.images = {}
+        self.texts = OrderedDict()
+        self.rings = {}
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, path, size=None):
+        """
+        Returns the image of the file, scaled to size, loading it on the first call
+        :param path: path of the image
+        :param size: (width, height) or None to keep the size of the file
+        :return: pygame Surface, shared, do not draw on it
+        """
+        key = (path, size)
+        image = self.images.get(key)
+
+        if image is None:
+            image = self.images.get((path, None))
+            if image is None:
+                image = pygame.image.load(path)
+                if pygame.display.get_surface() is not None:
+                    # blits are faster in the pixel format of the display
+                    image = image.convert_alpha()
+                self.images[(path, None)] = image
+            if size is not None:
+                image = self.images[key] = pygame.transform.scale(image, size)
+
+        return image
+
+    def text(self, string, color=(255, 255, 255), antialias=False, font=None):
+        """
+        Returns the rendered text, rendering it only if it is not cached
+        :param string: the text
+        :param color: colour of the text
+        :param antialias: render with antialiasing
+        :param font: pygame Font, defaults to the font of the settings
+        :return: pygame Surface, shared, do not draw on it
+        """
+        font = font or default_font
+        key = (string, tuple(color), bool(antialias), font)
+        surface = self.texts.get(key)
+
+        if surface is not None:
+            self.texts.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.texts[key] = font.render(string, antialias, color)
+        while len(self.texts) > self.max_texts:
+            self.texts.popitem(last=False)
+
+        return surface
+
+    def ring(self, *circles):
+        """
+        Returns a sprite with concentric circle outlines, centred on the middle of the
+        sprite, so drawing it is one blit at (x - radius, y - radius) of the largest.
+        The background is a run length encoded colour key, blitting the mostly empty
+        sprite is cheaper than drawing the circles
+        :param circles: (radius, colour, width) of every circle
+        :return: pygame Surface, shared, do not draw on it
+        """
+        sprite = self.rings.get(circles)
+
+        if sprite is None:
+            radius = max(int(circle[0]) for circle in circles)
+            colors = set(tuple(circle[1]) for circle in circles)
+            key = next(color for color in [(255, 0, 255), (0, 0, 0), (0, 0, 255)] if color not in colors)
+
+            sprite = pygame.Surface((2 * radius + 1, 2 * radius + 1))
+            sprite.fill(key)
+            for circle_radius, color, width in circles:
+                if circle_radius > 0:
+                    pygame.draw.circle(sprite, color, (radius, radius), circle_radius, width)
+
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            sprite.set_colorkey(key, pygame.RLEACCEL)
+            self.rings[circles] = sprite
+
+        return sprite
+
+    def clear(self):
+        self.images.clear()
+        self.texts.clear()
+        self.rings.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+assets = AssetCache()
@@ -1,10 +1,8 @@
 import math
 
-from numpy import sqrt
-
 
 def dist(x2, x1, y2, y1):
-    return sqrt((x2-x1)**2 + (y2-y1)**2)
+    return math.sqrt((x2-x1)**2 + (y2-y1)**2)
 
 
 def xy_dist(x2, x1, y2, y1):
@@ -0,0 +1,125 @@
+import pygame
+
+from commons.settings import Colors
+
+
+class LayeredRenderer:
+    """
+    Draws a frame in three layers and only sends the regions which changed to the display:
+    - the background, rendered once and copied back over the regions to clear
+    - the entities, blitted in one Surface.blits call, their rects are kept to clear them
+      on the next frame
+    - the HUD, drawn on top and only again when its content changed or entities touched it
+    When the changed regions cover most of the screen a full redraw is cheaper, so the
+    renderer falls back to it.
+    """
+
+    def __init__(self, screen, background=None, full_redraw_ratio=0.5):
+        """
+        :param screen: the display surface
+        :param background: static surface drawn under everything, a dark gray fill by default
+        :param full_redraw_ratio: share of the screen area above which the whole frame is redrawn
+        """
+        self.screen = screen
+        self.full_redraw_ratio = full_redraw_ratio
+        self.background = background
+        if self.background is None:
+            self.background = pygame.Surface(screen.get_size())
+            self.background.fill(Colors.DARKGRAY)
+            if pygame.display.get_surface() is not None:
+                self.background = self.background.convert()
+
+        self.entity_rects = []
+        self.entity_area = 0
+        self.hud_keys = None
+        self.hud_rects = []
+        self.scratch = None
+        self.full = True
+        self.full_frames = 0
+        self.dirty_frames = 0
+
+    def invalidate(self):
+        """
+        Redraws the whole frame next time, after the background or the screen changed
+        """
+        self.full = True
+
+    def render(self, sprites, lines=(), hud=()):
+        """
+        Draws a frame and updates the display
+        :param sprites: (surface, (x, y)) pairs of the entities, in drawing order
+        :param lines: (colour, start, end, width) lines drawn over the sprites
+        :param hud: (key, draw) pairs, draw(screen) draws a part of the HUD and key
+                    changes whenever what it draws changes
+        :return: list of the rects sent to the display
+        """
+        hud_keys = [key for key, _ in hud]
+        hud_changed = hud_keys != self.hud_keys
+        old_hud_rects = self.hud_rects
+        if hud_changed:
+            self.hud_keys = hud_keys
+            self.hud_rects = [self._bounds(draw) for _, draw in hud]
+
+        clear = list(self.entity_rects)
+        redraw_hud = hud_changed
+        if hud_changed:
+            clear += old_hud_rects + self.hud_rects
+        elif any(rect.collidelist(self.entity_rects) != -1 for rect in self.hud_rects):
+            clear += self.hud_rects
+            redraw_hud = True
+
+        # the entities of this frame are not drawn yet, they should cover about as much as the last ones
+        screen_area = self.screen.get_width() * self.screen.get_height()
+        dirty_area = 2 * self.entity_area + sum([rect.width * rect.height for rect in clear[len(self.entity_rects):]])
+        full = self.full or dirty_area > self.full_redraw_ratio * screen_area
+
+        if full:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            self.screen.blits([(self.background, rect, rect) for rect in clear], doreturn=False)
+
+        entity_rects = self.screen.blits(sprites)
+        entity_rects += [pygame.draw.line(self.screen, color, start, end, width)
+                         for color, start, end, width in lines]
+
+        if full or redraw_hud:
+            for _, draw in hud:
+                draw(self.screen)
+        else:
+            # entities drawn over the HUD, the regions they touched are drawn again in order under a clip
+            for rect in self.hud_rects:
+                if rect.collidelist(entity_rects) == -1:
+                    continue
+                self.screen.set_clip(rect)
+                self.screen.blit(self.background, rect, rect)
+                self.screen.blits(sprites, doreturn=False)
+                for color, start, end, width in lines:
+                    pygame.draw.line(self.screen, color, start, end, width)
+                for _, draw in hud:
+                    draw(self.screen)
+                self.screen.set_clip(None)
+
+        self.entity_rects = entity_rects
+        self.entity_area = sum([rect.width * rect.height for rect in entity_rects])
+        self.full = False
+
+        if full:
+            self.full_frames += 1
+            pygame.display.update()
+            return [self.screen.get_rect()]
+
+        self.dirty_frames += 1
+        updated = clear + entity_rects + (self.hud_rects if redraw_hud else [])
+        pygame.display.update(updated)
+        return updated
+
+    def _bounds(self, draw):
+        # draws on a colour keyed scratch surface to find the region a HUD part covers
+        if self.scratch is None:
+            self.scratch = pygame.Surface(self.screen.get_size())
+            self.scratch.set_colorkey((255, 0, 255))
+
+        self.scratch.fill((255, 0, 255))
+        draw(self.scratch)
+
+        return self.scratch.get_bounding_rect()
@@ -0,0 +1,115 @@
+import time
+
+
+class FixedStepScheduler:
+    """
+    Decides how many simulation ticks run before each rendered frame.
+    Elapsed real time, times the speed, is accumulated and consumed in fixed steps of
+    1 / tick_rate seconds, so the simulation keeps its pace whatever the frame rate is.
+    A tick is always the same step of the world, so the simulation is deterministic at
+    any render rate, only the number of ticks between two frames changes.
+    In turbo mode the ticks are not paced, as many as fit in the frame budget run.
+    """
+
+    SPEEDS = [0.25, 0.5, 1, 2, 4, 8, 16, 32, 64]
+
+    def __init__(self, tick_rate=100, frame_rate=60, max_ticks=1000, turbo_budget=0.8, clock=time.perf_counter):
+        """
+        :param tick_rate: ticks per second at speed 1
+        :param frame_rate: target frames per second, turbo mode fills that frame time
+        :param max_ticks: most ticks run in one frame, the time behind that is dropped so a
+                          simulation slower than real time cannot freeze the window
+        :param turbo_budget: share of the frame time turbo mode spends on ticks
+        :param clock: function returning the time in seconds
+        """
+        self.tick_rate = tick_rate
+        self.frame_rate = frame_rate
+        self.max_ticks = max_ticks
+        self.turbo_budget = turbo_budget
+        self.clock = clock
+        self.speed = 1
+        self.turbo = False
+        self.accumulator = 0.0
+        self.last = None
+
+        self.ticks = 0
+        self.frames = 0
+        self.ticks_per_sec = 0.0
+        self.frames_per_sec = 0.0
+        self._window_start = clock()
+        self._window_ticks = 0
+        self._window_frames = 0
+
+    def faster(self):
+        self.speed = self.SPEEDS[min(self.SPEEDS.index(self.speed) + 1, len(self.SPEEDS) - 1)]
+
+    def slower(self):
+        self.speed = self.SPEEDS[max(self.SPEEDS.index(self.speed) - 1, 0)]
+
+    def toggle_turbo(self):
+        self.turbo = not self.turbo
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets the elapsed time, after a pause the simulation goes on without catching up
+        """
+        self.accumulator = 0.0
+        self.last = None
+
+    def run(self, step):
+        """
+        Runs the ticks due since the last call
+        :param step: callable running one tick of the simulation
+        :return: number of ticks run
+        """
+        now = self.clock()
+
+        if self.turbo:
+            deadline = now + self.turbo_budget / self.frame_rate
+            ticks = 0
+            while ticks < self.max_ticks:
+                step()
+                ticks += 1
+                if self.clock() >= deadline:
+                    break
+            self.last = self.clock()
+        else:
+            if self.last is not None:
+                self.accumulator += (now - self.last) * self.speed
+            self.last = now
+
+            ticks = min(int(self.accumulator * self.tick_rate), self.max_ticks)
+            if ticks == self.max_ticks:
+                self.accumulator = 0.0
+            else:
+                self.accumulator -= ticks / self.tick_rate
+
+            for _ in range(ticks):
+                step()
+
+        self.ticks += ticks
+        self._window_ticks += ticks
+        self._measure()
+
+        return ticks
+
+    def frame(self):
+        """
+        Counts a rendered frame
+        """
+        self.frames += 1
+        self._window_frames += 1
+        self._measure()
+
+    def _measure(self):
+        # ticks and frames per second over windows of about a second
+        now = self.clock()
+        elapsed = now - self._window_start
+
+        if elapsed >= 1:
+            self.ticks_per_sec = self._window_ticks / elapsed
+            self.frames_per_sec = self._window_frames / elapsed
+            self._window_start = now
+            self._window_ticks = 0
+            self._window_frames = 0
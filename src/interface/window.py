@@ -3,18 +3,17 @@ from datetime import datetime
 
 from pygame.locals import *
 
-from algorithm.activations import tanh
 from algorithm.draw import draw_brain_pygame, draw_species_bar_pygame
-from algorithm.options import Options
-from algorithm.population import Population
-from algorithm.save import save_brain, load_brain
-from commons.functions import euclidian_distance
+from algorithm.save import save_brain
+from commons.assets import assets
 from commons.settings import *
-from world import Food, CellV5
+from interface.renderer import LayeredRenderer
+from interface.scheduler import FixedStepScheduler
+from world.simulation import Simulation
 
 
 class MainWindow:
-    def __init__(self, load_state=None):
+    def __init__(self, load_state=None, checkpoint=None):
         os.environ['SDL_VIDEO_CENTERED'] = '1'
         pygame.display.set_caption("Game of Life (?)")
         pygame.event.set_allowed([QUIT, KEYDOWN, MOUSEBUTTONDOWN])
@@ -23,116 +22,68 @@ class MainWindow:
         self.screen = pygame.display.set_mode([WindowSettings.WIDTH, WindowSettings.HEIGHT])
         self.clock = pygame.time.Clock()
         self.paused = True
-        self.new_gen_event = pygame.USEREVENT + 1
-        self.gens_per_sec = 100
-        pygame.time.set_timer(self.new_gen_event, int(1000 / self.gens_per_sec))
-        self.cells = []
-        self.foods = []
-        self.world_info = []
+        self.ticks_per_sec = 100
+        self.scheduler = FixedStepScheduler(self.ticks_per_sec, self.FPS)
         self.generation = 0
-        self.simulation_time = 1
+        self.only_new_generations = False
         self.move = False
-        self.load_state = load_state
         self.mobs = []
-        Options.set_options(1, 2, 20, activation_func=tanh)
-        self.population = None
-        self.best = None
-        self.best_score = None
-        self.generate_population(first_gen=True)
-        self.generate_world_environment()
+        self.show_vision = True
+        self.renderer = LayeredRenderer(self.screen)
+        self.simulation = Simulation(self.screen, load_state=load_state, checkpoint=checkpoint)
         self.update_population()
 
     def update_world(self, manual=False):
-        self.simulation_time += 1
-        dead_cells = []
-
-        for x, cell in enumerate(self.cells):
-            objects_in_view = [other_info for other_info in self.world_info
-                               if euclidian_distance(cell.LOCATION.x,
-                                                     cell.LOCATION.y,
-                                                     other_info.LOCATION.x,
-                                                     other_info.LOCATION.y) < cell.DNA.vision_range]
-
-            if not manual:
-                cell.apply_decisions(cell.think(objects_in_view))
-            else:
-                # FIXME: Manual movement not working
-                cell.think()
-                #keys = pygame.key.get_pressed()
-                #self.cells[-1].on_manual(keys)
-
-            cell.update_creature_properties()
-
-            if cell.is_dead():
-                dead_cells.append(cell)
-
-            if self.simulation_time > 30:
-                for food in objects_in_view:
-                    distance = euclidian_distance(food.LOCATION.x + 10,
-                                                  food.LOCATION.y + 10,
-                                                  cell.LOCATION.x,
-                                                  cell.LOCATION.y)
-                    if distance < cell.DNA.vision_range - 170:
-                        cell.eat(food)
-                        food.respawn()
-
-        for cell in dead_cells:
-            self.cells.remove(cell)
-
-        if len(self.cells) == 0:
-            self.generate_population(first_gen=False)
-            self.generate_world_environment()
-
-        self.update_population()
-
-    def generate_population(self, first_gen):
-        # TODO: if we had a body parameter inside the cell and mix the brain and
-        #  body when doing the crossover and mutation stuff?
-
-        if first_gen:
-            self.population = Population()
-        else:
-            self.population.epoch()
-            print(f'Generation {self.population.gen}, melhorzin: {self.population.best}')
-            print(self.population)
-            self.best = self.population.best.id
-            self.best_score = self.population.best.fitness
-
-        if self.load_state and first_gen:
-            # FIXME: Does not evolve if load_state
-            self.cells = [CellV5(self.screen, name=brain.id, brain=load_brain(self.load_state))
-                          for brain in self.population.pool]
-        else:
-            self.cells = [CellV5(self.screen, name=brain.id, brain=brain) for brain in self.population.pool]
-
-    def generate_world_environment(self):
-        self.foods = []
-        for i in range(20):
-            self.foods.append(Food(self.screen, name=i, color=(255, 0, 255)))
+        self.simulation.step(manual)
 
     def update_population(self):
-        self.screen.fill(Colors.DARKGRAY)
-        for cell in self.cells:
-            cell.render()
-        for food in self.foods:
-            food.render()
-        for mob in self.mobs:
-            mob.render()
-
-        self.update_label()
-        self.world_info = self.foods
-        pygame.display.update()
-
-    def update_label(self):
-        if self.population:
-            draw_brain_pygame(self.screen, self.population.best, 10, WindowSettings.HEIGHT - 300, 200, circle_size=8)
-            draw_species_bar_pygame(self.screen, self.population, 300, 10)
-
-        self.screen.blit(font.render(f"Generation: {self.population.gen}", True,
-                                     (255, 255, 255)), (10, WindowSettings.HEIGHT - 100))
-
-        self.screen.blit(font.render(f"Best: Cell {self.best} Score {self.best_score}", True,
-                                     (255, 255, 255)), (10, WindowSettings.HEIGHT - 50))
+        sprites = []
+        lines = []
+        for cell in self.simulation.cells:
+            sprites += cell.sprites(vision=self.show_vision)
+            lines.append(cell.tail())
+        for food in self.simulation.foods:
+            sprites += food.sprites()
+
+        self.renderer.render(sprites, lines, self.hud())
+
+        if self.mobs:
+            # mobs only know how to render themselves, so they are drawn over the frame
+            # and the next frame is a full redraw to clear them
+            for mob in self.mobs:
+                mob.render()
+            pygame.display.update()
+            self.renderer.invalidate()
+
+    def hud(self):
+        """
+        The parts of the HUD, see LayeredRenderer.render
+        :return: list of (key, draw) pairs
+        """
+        population = self.simulation.population
+        generation = f"Generation: {population.gen}"
+        best = f"Best: Cell {self.simulation.best} Score {self.simulation.best_score}"
+        scheduler = self.scheduler
+        stats = f"{scheduler.ticks_per_sec:.0f} ticks/s {scheduler.frames_per_sec:.0f} fps " \
+                f"{'turbo' if scheduler.turbo else f'x{scheduler.speed:g}'}" \
+                f"{' new generations only' if self.only_new_generations else ''}"
+
+        return [
+            (('brain', id(population), population.gen, id(population.best)),
+             lambda screen: draw_brain_pygame(screen, population.best, 10, WindowSettings.HEIGHT - 300, 200,
+                                              circle_size=8)),
+            (('species', id(population), population.gen),
+             lambda screen: draw_species_bar_pygame(screen, population, 300, 10)),
+            (('text', generation),
+             lambda screen: screen.blit(assets.text(generation, (255, 255, 255), True),
+                                        (10, WindowSettings.HEIGHT - 100))),
+            (('text', best),
+             lambda screen: screen.blit(assets.text(best, (255, 255, 255), True),
+                                        (10, WindowSettings.HEIGHT - 50))),
+            (('text', stats),
+             lambda screen: screen.blit(assets.text(stats, (255, 255, 255), True),
+                                        (WindowSettings.WIDTH - 400, WindowSettings.HEIGHT - 50)))
+        ]
 
     def run(self):
         """
@@ -140,8 +91,26 @@ class MainWindow:
         """
         while True:
             self.handle_events()
+            self.update_frame()
             self.delta = self.clock.tick(self.FPS)
 
+    def update_frame(self):
+        """
+        Runs the simulation ticks due for this frame, then renders the frame if the world changed
+        """
+        if self.paused:
+            self.scheduler.reset()
+            return
+
+        generation = self.simulation.population.gen
+        if not self.scheduler.run(self.update_world):
+            return
+        if self.only_new_generations and self.simulation.population.gen == generation:
+            return
+
+        self.update_population()
+        self.scheduler.frame()
+
     def handle_mouse_buttons(self, event: pygame.event.Event, button: (bool, bool, bool)):
         """
         This function handles all the events related to the mouse buttons
@@ -158,15 +127,27 @@ class MainWindow:
         if event.key == pygame.K_p:
             print("'p' pressed! - toggling pause")
             self.paused = not self.paused
+        if event.key == pygame.K_v:
+            # the vision circles cover most of the screen, without them only small regions are redrawn
+            self.show_vision = not self.show_vision
+            self.renderer.invalidate()
+        if event.key == pygame.K_t:
+            self.scheduler.toggle_turbo()
+        if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.scheduler.faster()
+        if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.scheduler.slower()
+        if event.key == pygame.K_g:
+            self.only_new_generations = not self.only_new_generations
         if not self.paused:
             if event.key == K_DOWN:
-                self.cells[-1].move(DOWN)
+                self.simulation.cells[-1].move(DOWN)
             if event.key == K_UP:
-                self.cells[-1].move(UP)
+                self.simulation.cells[-1].move(UP)
             if event.key == K_RIGHT:
-                self.cells[-1].move(RIGHT)
+                self.simulation.cells[-1].move(RIGHT)
             if event.key == K_LEFT:
-                self.cells[-1].move(LEFT)
+                self.simulation.cells[-1].move(LEFT)
 
     def handle_events(self):
         """
@@ -174,10 +155,8 @@ class MainWindow:
         """
         for event in pygame.event.get():
 
-            if event.type == self.new_gen_event and not self.paused:
-                self.update_world(manual=False)
-            elif event.type == QUIT:
-                save_brain(self.population.best, f'cell-{datetime.now()}.json')
+            if event.type == QUIT:
+                save_brain(self.simulation.population.best, f'cell-{datetime.now()}.json')
                 quit("App window was closed!")
             elif event.type == KEYDOWN:
                 self.handle_keys(event)
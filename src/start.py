@@ -1,5 +1,16 @@
-from interface.window import MainWindow
+import os
+import sys
 
 if __name__ == '__main__':
-    # MainWindow(load_state="cell-2021-08-30 16:07:57.605675.json").run()
-    MainWindow().run()
+    # --checkpoint <file>: resume from the file if it exists and save to it after every generation
+    checkpoint = sys.argv[sys.argv.index('--checkpoint') + 1] if '--checkpoint' in sys.argv else None
+
+    if '--headless' in sys.argv:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1')
+        from world.simulation import Simulation
+        Simulation(checkpoint=checkpoint).run()
+    else:
+        from interface.window import MainWindow
+        # MainWindow(load_state="cell-2021-08-30 16:07:57.605675.json").run()
+        MainWindow(checkpoint=checkpoint).run()
@@ -1,15 +1,17 @@
 import pygame
 import pyxel
 from numpy.random import uniform
-from commons.settings import DefaultSettings, WindowSettings, Direction, Size, font, Location
+from commons.assets import assets
+from commons.settings import DefaultSettings, WindowSettings, Direction, Size, Location
 
 
 class Food(pygame.sprite.Sprite):
     def __init__(self, screen, color, name, position: list = None):
         pygame.sprite.Sprite.__init__(self)
 
-        self.image = pygame.image.load("interface/assets/food.png")
-        self.image = pygame.transform.scale(self.image, (20, 20))
+        self.image = None
+        if screen is not None:
+            self.image = assets.image("interface/assets/food.png", (20, 20))
         self.LOCATION = Location(
             x=uniform(0 + WindowSettings.MARGIN,
                       WindowSettings.WIDTH - WindowSettings.MARGIN),
@@ -19,7 +21,7 @@ class Food(pygame.sprite.Sprite):
         if position:
             self.update_location(x=position[0], y=position[1])
 
-        self.rect = self.image.get_rect(x=self.LOCATION.x, y=self.LOCATION.y)
+        self.rect = self.image.get_rect(x=self.LOCATION.x, y=self.LOCATION.y) if self.image else None
         self.energy = 20
         self.color = color
         self.screen = screen
@@ -36,13 +38,20 @@ class Food(pygame.sprite.Sprite):
                       WindowSettings.HEIGHT - WindowSettings.MARGIN))
 
     def label(self):
-        return font.render(f"{self.name}", 0, (255, 255, 255))
+        return assets.text(self.name, (255, 255, 255))
 
     def render(self):
-        self.screen.blit(self.image, [self.LOCATION.x, self.LOCATION.y])
-        self.screen.blit(self.label(), (self.LOCATION.x + 35, self.LOCATION.y + 10))
+        self.screen.blits(self.sprites(), doreturn=False)
         self.rect = self.image.get_rect()
         # pygame.draw.rect(self.screen, self.color, self.rect)
 
+    def sprites(self):
+        """
+        Returns the sprites of the food: image and label
+        :return: list of (surface, (x, y)) pairs
+        """
+        return [(self.image, (self.LOCATION.x, self.LOCATION.y)),
+                (self.label(), (self.LOCATION.x + 35, self.LOCATION.y + 10))]
+
     def update_location(self, **kwargs):
-        self.LOCATION = self.LOCATION._replace(**kwargs)
\ No newline at end of file
+        self.LOCATION = self.LOCATION._replace(**kwargs)
@@ -0,0 +1,76 @@
+from collections import namedtuple
+
+import numpy
+
+Perception = namedtuple("Perception", [
+    "index",
+    "distance",
+    "heading",
+    "in_view"
+])
+
+
+def perceive(xs, ys, orientations, food_xs, food_ys, vision_range, block_size=1 << 15):
+    """
+    Finds the closest food in view of every cell at once, like BaseCell.info_to_vec and
+    calc_heading do for one cell. The distances are broadcast over blocks of
+    (cells, foods) pairs small enough to stay in cache, so the memory stays bounded
+    with many cells and foods. The closest food of a cell is in view if any is, so
+    there is no masking before the argmin.
+    :param xs: x of the cells
+    :param ys: y of the cells
+    :param orientations: orientation of the cells, in degrees
+    :param food_xs: x of the foods
+    :param food_ys: y of the foods
+    :param vision_range: vision range of all the cells, or one per cell
+    :param block_size: maximum number of (cell, food) pairs per block
+    :return: Perception with, for every cell, the index of the closest food in view or -1,
+             its distance or inf, its heading relative to the orientation divided by 180
+             or 0 when nothing is in view, like Cell.sense, and the (cells, foods) matrix
+             telling which foods are in view
+    """
+    xs = numpy.asarray(xs, dtype=float)
+    ys = numpy.asarray(ys, dtype=float)
+    orientations = numpy.asarray(orientations, dtype=float)
+    food_xs = numpy.asarray(food_xs, dtype=float)
+    food_ys = numpy.asarray(food_ys, dtype=float)
+    vision_range = numpy.broadcast_to(numpy.asarray(vision_range, dtype=float), xs.shape)
+
+    num_cells = len(xs)
+    num_foods = len(food_xs)
+
+    index = numpy.full(num_cells, -1, dtype=numpy.intp)
+    distance = numpy.full(num_cells, numpy.inf)
+    heading = numpy.zeros(num_cells)
+    in_view = numpy.zeros((num_cells, num_foods), dtype=bool)
+
+    if not num_cells or not num_foods:
+        return Perception(index, distance, heading, in_view)
+
+    block = max(1, block_size // num_foods)
+
+    for start in range(0, num_cells, block):
+        stop = min(start + block, num_cells)
+        rows = numpy.arange(stop - start)
+
+        d_x = food_xs - xs[start:stop, None]
+        d_y = food_ys - ys[start:stop, None]
+        d_x *= d_x
+        d_y *= d_y
+        d_x += d_y
+        dist = numpy.sqrt(d_x, out=d_x)
+
+        closest = dist.argmin(axis=1)
+        nearest = dist[rows, closest]
+        found = nearest < vision_range[start:stop]
+
+        theta_d = numpy.degrees(numpy.arctan2(food_ys[closest] - ys[start:stop],
+                                              food_xs[closest] - xs[start:stop])) - orientations[start:stop]
+        theta_d[numpy.abs(theta_d) > 180] += 360
+
+        index[start:stop] = numpy.where(found, closest, -1)
+        distance[start:stop] = numpy.where(found, nearest, numpy.inf)
+        heading[start:stop] = numpy.where(found, theta_d / 180, 0)
+        numpy.less(dist, vision_range[start:stop, None], out=in_view[start:stop])
+
+    return Perception(index, distance, heading, in_view)
@@ -5,9 +5,10 @@ from random import uniform
 import pygame
 
 from algorithm.brain import Brain
-from commons.nn_maths_functions import dist_to_item
+from commons.nn_maths_functions import dist
 from commons.settings import WindowSettings
 from world import Food
+from world.state import WorldState
 
 DNA = namedtuple("DNA", [
     "color_r",
@@ -32,8 +33,12 @@ Location = namedtuple("Location", [
 
 
 class BaseCell:
+    """
+    Base of the cells. Location, health and fitness live in a row of a WorldState
+    shared by the whole population, LOCATION and STATE are views on that row.
+    """
 
-    def __init__(self, brain: Brain):
+    def __init__(self, brain: Brain, world: WorldState = None):
 
         self.DNA = DNA(
             color_r=255,
@@ -45,26 +50,49 @@ class BaseCell:
             vision_range=200,
         )
 
-        self.STATE = State(
-            health=100,
-        )
-
-        self.LOCATION = Location(
+        self.world = world if world is not None else WorldState(1)
+        self.row = self.world.add(
             x=uniform(0 + WindowSettings.MARGIN,
                       WindowSettings.WIDTH - WindowSettings.MARGIN),
             y=uniform(0 + WindowSettings.MARGIN,
                       WindowSettings.HEIGHT - WindowSettings.MARGIN),
-            orientation=0
+            orientation=0,
+            speed=self.DNA.speed,
+            health=100,
         )
 
         self.brain = brain
         self.brain.fitness = 0
-        self.magic = 0.04
+
+    @property
+    def LOCATION(self):
+        return Location(
+            x=self.world.x.item(self.row),
+            y=self.world.y.item(self.row),
+            orientation=self.world.orientation.item(self.row)
+        )
+
+    @LOCATION.setter
+    def LOCATION(self, location):
+        self.world.x[self.row], self.world.y[self.row], self.world.orientation[self.row] = location
+
+    @property
+    def STATE(self):
+        return State(health=self.world.health.item(self.row))
+
+    @STATE.setter
+    def STATE(self, state):
+        self.world.health[self.row] = state.health
+
+    @property
+    def magic(self):
+        return self.world.magic
 
     def calc_heading(self, other):
-        d_x = other.LOCATION.x - self.LOCATION.x
-        d_y = other.LOCATION.y - self.LOCATION.y
-        theta_d = degrees(atan2(d_y, d_x)) - self.LOCATION.orientation
+        location = self.LOCATION
+        d_x = other.LOCATION.x - location.x
+        d_y = other.LOCATION.y - location.y
+        theta_d = degrees(atan2(d_y, d_x)) - location.orientation
         if abs(theta_d) > 180:
             theta_d += 360
         return theta_d / 180
@@ -79,8 +107,9 @@ class BaseCell:
         # Get the closest other
         closest_dist_so_far = None
         other = None
+        location = self.LOCATION
         for item in others:
-            other_org_dist = dist_to_item(self, item)
+            other_org_dist = dist(item.LOCATION.x, location.x, item.LOCATION.y, location.y)
             if closest_dist_so_far is None or other_org_dist < closest_dist_so_far:
                 closest_dist_so_far = other_org_dist
                 other = item
@@ -91,7 +120,14 @@ class BaseCell:
             raise NotImplementedError("Creatures can only 'see' other creatures and foods")
 
     def update_fitness(self, fitness):
-        self.brain.fitness = self.brain.fitness + fitness
+        self.world.fitness[self.row] += fitness
+        self.sync_fitness()
+
+    def sync_fitness(self):
+        """
+        Copies the fitness of the row to the brain, the vectorized step only updates the row
+        """
+        self.brain.fitness = self.world.fitness.item(self.row)
 
     def update_health(self, health):
         self.STATE = State(health=min(round(self.STATE.health + health, 2), 200))
@@ -2,8 +2,10 @@ from math import cos, radians, sin
 
 import pygame
 from algorithm.brain import Brain
-from commons.settings import Colors, font
+from commons.assets import assets
+from commons.settings import Colors
 from world.population.base import BaseCell
+from world.state import WorldState
 
 
 class Cell(BaseCell):
@@ -13,8 +15,8 @@ class Cell(BaseCell):
     ]
     """
 
-    def __init__(self, screen, name: str, brain: Brain):
-        BaseCell.__init__(self, brain)
+    def __init__(self, screen, name: str, brain: Brain, world: WorldState = None):
+        BaseCell.__init__(self, brain, world)
 
         self.age = 0
         self.screen = screen
@@ -25,55 +27,60 @@ class Cell(BaseCell):
                f"Age - {self.age}"
 
     def render(self):
+        for surface, position in self.sprites():
+            self.screen.blit(surface, position)
+        pygame.draw.line(self.screen, *self.tail())
+
+    def sprites(self, vision=True):
+        """
+        Returns the sprites of the cell: body, vision circles and labels
+        :param vision: include the vision circles
+        :return: list of (surface, (x, y)) pairs
+        """
+        location = self.LOCATION
+        # draw.circle truncates the centre, so do the sprites to land on the same pixels
+        x = int(location.x)
+        y = int(location.y)
+
+        sprites = [(assets.ring((10, (self.DNA.color_r, self.DNA.color_g, self.DNA.color_b), 2)), (x - 10, y - 10))]
+
+        if vision:
+            sprites.append((assets.ring((self.DNA.vision_range, Colors.GREEN, 1),
+                                        (self.DNA.vision_range - 170, Colors.YELLOW, 1)),
+                            (x - self.DNA.vision_range, y - self.DNA.vision_range)))
+
+        sprites.append((assets.text(f"{self.STATE.health}"), (location.x + 35, location.y + 10)))
+        sprites.append((assets.text(f"{self.brain.id}"), (location.x - 40, location.y + 10)))
+
+        return sprites
+
+    def tail(self):
+        """
+        Returns the line showing the orientation of the cell
+        :return: (colour, start, end, width)
+        """
+        location = self.LOCATION
         tail_len = 20
-        x2 = cos(radians(self.LOCATION.orientation)) * tail_len + self.LOCATION.x
-        y2 = sin(radians(self.LOCATION.orientation)) * tail_len + self.LOCATION.y
-        # Body
-        pygame.draw.circle(self.screen, (self.DNA.color_r, self.DNA.color_g, self.DNA.color_b),
-                           (self.LOCATION.x, self.LOCATION.y), 10, 2)
-        pygame.draw.line(self.screen, (self.DNA.color_r, self.DNA.color_g, self.DNA.color_b),
-                         (self.LOCATION.x, self.LOCATION.y), (x2, y2), 2)
-
-        # Vision
-        pygame.draw.circle(self.screen, Colors.GREEN,
-                           [self.LOCATION.x, self.LOCATION.y], self.DNA.vision_range, 1)
-        pygame.draw.circle(self.screen, Colors.YELLOW,
-                           [self.LOCATION.x, self.LOCATION.y], self.DNA.vision_range - 170, 1)
-
-        # Labels
-        health = font.render(f"{self.STATE.health}", 0, (255, 255, 255))
-        self.screen.blit(health, (self.LOCATION.x + 35, self.LOCATION.y + 10))
-        brain_id = font.render(f"{self.brain.id}", 0, (255, 255, 255))
-        self.screen.blit(brain_id, (self.LOCATION.x - 40, self.LOCATION.y + 10))
+        x2 = cos(radians(location.orientation)) * tail_len + location.x
+        y2 = sin(radians(location.orientation)) * tail_len + location.y
 
-    def think(self, objects_in_view):
-        outputs = []
-        inputs = []
+        return (self.DNA.color_r, self.DNA.color_g, self.DNA.color_b), (location.x, location.y), (x2, y2), 2
 
+    def sense(self, objects_in_view):
         if len(objects_in_view) == 0:
-            #inputs.append([self.STATE.health, 0])
-            inputs.append([0])
-        else:
-            object_inputs = self.info_to_vec(objects_in_view)
-            #inputs.append([self.STATE.health, object_inputs])
-            inputs.append([object_inputs])
+            #return [self.STATE.health, 0]
+            return [0]
 
-        for input_ in inputs:
-            outputs.append(self.brain.predict(input_))
-        return outputs
+        object_inputs = self.info_to_vec(objects_in_view)
+        #return [self.STATE.health, object_inputs]
+        return [object_inputs]
+
+    def think(self, objects_in_view):
+        return [self.brain.predict(self.sense(objects_in_view))]
 
     def apply_decisions(self, decisions):
         for decision in decisions:
-            tmp_orientation = self.LOCATION.orientation + decision[0] * 720 * self.magic
-            self.update_location(orientation=tmp_orientation % 360)
-
-            tmp_speed = self.DNA.speed + decision[1] * self.magic
-            if tmp_speed < 0:
-                tmp_speed = 0
-
-            dx = tmp_speed * cos(radians(self.LOCATION.orientation)) * self.magic
-            dy = tmp_speed * sin(radians(self.LOCATION.orientation)) * self.magic
-            self.update_location(x=self.LOCATION.x+dx, y=self.LOCATION.y+dy)
+            self.world.move([self.row], [decision])
 
     def eat(self, food):
         self.update_health(food.energy)
@@ -82,10 +89,5 @@ class Cell(BaseCell):
         """
         Updates the creature properties according to its actions.
         """
-        self.update_fitness(1)
-        self.update_health(-0.1)
-
-        if self.STATE.health <= 0:
-            self.kill()
-
-
+        self.world.update_properties([self.row])
+        self.sync_fitness()
@@ -0,0 +1,202 @@
+import heapq
+import os
+from datetime import datetime
+
+import numpy
+
+from algorithm.activations import tanh
+from algorithm.batch import predict_batch
+from algorithm.options import Options
+from algorithm.population import Population
+from algorithm.save import save_brain, load_brain
+from commons.functions import euclidian_distance
+from world import Food, CellV5
+from world.perception import perceive
+from world.state import WorldState
+
+
+class Simulation:
+    """
+    The world and its evolution, without any display.
+    Observers are called with the simulation after every step, so a viewer can
+    render the world while the simulation itself can free run on a server.
+    The cells of a generation share one WorldState, so perception, moving and
+    ageing are vectorized steps over the arrays of the living cells.
+    With a checkpoint file the population is saved after every generation, and
+    resumed from it on start if the file exists.
+    """
+
+    def __init__(self, screen=None, load_state=None, food_num=20, population_size=20, checkpoint=None):
+        self.screen = screen
+        self.load_state = load_state
+        self.checkpoint = checkpoint
+        self.food_num = food_num
+        self.cells = []
+        self.state = None
+        self.foods = []
+        self.world_info = []
+        self.simulation_time = 1
+        self.observers = []
+        Options.set_options(1, 2, population_size, activation_func=tanh)
+        self.population = None
+        self.best = None
+        self.best_score = None
+        self.generate_population(first_gen=True)
+        self.generate_world_environment()
+
+    def add_observer(self, observer):
+        """
+        Registers a callable which receives the simulation after every step
+        :param observer: callable
+        """
+        self.observers.append(observer)
+
+    def step(self, manual=False):
+        """
+        Runs one tick of the world: perception, decisions, properties, eating and
+        the next generation once every cell is dead
+        """
+        self.simulation_time += 1
+        dead_cells = []
+        rows = [cell.row for cell in self.cells]
+
+        perception = perceive(self.state.x[rows],
+                              self.state.y[rows],
+                              self.state.orientation[rows],
+                              [food.LOCATION.x for food in self.foods],
+                              [food.LOCATION.y for food in self.foods],
+                              [cell.DNA.vision_range for cell in self.cells])
+
+        if not manual and self.cells:
+            decisions = predict_batch([cell.brain for cell in self.cells], perception.heading)
+            dead = self.state.step(rows, decisions)
+        else:
+            for cell in self.cells:
+                # FIXME: Manual movement not working
+                cell.think()
+                #keys = pygame.key.get_pressed()
+                #self.cells[-1].on_manual(keys)
+            dead = self.state.update_properties(rows)
+
+        xs = self.state.x[rows].tolist()
+        ys = self.state.y[rows].tolist()
+
+        for cell, is_dead in zip(self.cells, dead.tolist()):
+            if is_dead:
+                cell.sync_fitness()
+                dead_cells.append(cell)
+
+        if self.simulation_time > 30:
+            self.feed(xs, ys, perception.in_view)
+
+        for cell in dead_cells:
+            self.cells.remove(cell)
+
+        if len(self.cells) == 0:
+            self.generate_population(first_gen=False)
+            self.generate_world_environment()
+
+        for observer in self.observers:
+            observer(self)
+
+    def feed(self, xs, ys, in_view):
+        """
+        Cells eat, in order, the foods of their view which are close enough, and
+        the foods respawn. Only the cells with a food in reach are visited, and a
+        respawned food is checked again at its new location for the next cells
+        which had it in view
+        :param xs: x of the cells after moving
+        :param ys: y of the cells after moving
+        :param in_view: (cells, foods) matrix of the foods in view, see perceive
+        """
+        if not self.cells or not self.foods:
+            return
+
+        food_xs = numpy.array([food.LOCATION.x + 10 for food in self.foods])
+        food_ys = numpy.array([food.LOCATION.y + 10 for food in self.foods])
+        reach = numpy.array([cell.DNA.vision_range - 170 for cell in self.cells], dtype=float)
+
+        d_x = food_xs - numpy.array(xs)[:, None]
+        d_y = food_ys - numpy.array(ys)[:, None]
+        close = in_view & (numpy.sqrt(d_x * d_x + d_y * d_y) < reach[:, None])
+
+        waiting = numpy.flatnonzero(close.any(axis=1)).tolist()
+        respawned = set()
+        visited = set()
+
+        while waiting:
+            i = heapq.heappop(waiting)
+            if i in visited:
+                continue
+            visited.add(i)
+
+            cell = self.cells[i]
+            foods = sorted([k for k in numpy.flatnonzero(close[i]).tolist() if k not in respawned] +
+                           [k for k in respawned if in_view[i, k]])
+
+            for k in foods:
+                food = self.foods[k]
+                distance = euclidian_distance(food.LOCATION.x + 10,
+                                              food.LOCATION.y + 10,
+                                              xs[i],
+                                              ys[i])
+                if distance < cell.DNA.vision_range - 170:
+                    cell.eat(food)
+                    food.respawn()
+                    respawned.add(k)
+                    for j in (numpy.flatnonzero(in_view[i + 1:, k]) + i + 1).tolist():
+                        heapq.heappush(waiting, j)
+
+    def run(self, generations=None):
+        """
+        Steps the world as fast as possible until the population reaches the
+        given generation, or forever. The best brain is saved when interrupted
+        :param generations: int
+        """
+        try:
+            while generations is None or self.population.gen < generations:
+                self.step()
+        except KeyboardInterrupt:
+            save_brain(self.population.best, f'cell-{datetime.now()}.json')
+            raise
+
+        return self.population.best
+
+    def generate_population(self, first_gen):
+        # TODO: if we had a body parameter inside the cell and mix the brain and
+        #  body when doing the crossover and mutation stuff?
+
+        if first_gen and self.checkpoint and os.path.exists(self.checkpoint):
+            self.population = Population.from_checkpoint(self.checkpoint)
+            # cells only eat after the first ticks of the world, so its clock goes on too
+            self.simulation_time = self.population.extra.get('simulation_time', self.simulation_time)
+            print(f'Resumed generation {self.population.gen} from {self.checkpoint}')
+            self.best = self.population.best.id
+            self.best_score = self.population.best.fitness
+        elif first_gen:
+            self.population = Population()
+        else:
+            self.population.epoch()
+            print(f'Generation {self.population.gen}, melhorzin: {self.population.best}')
+            print(self.population)
+            self.best = self.population.best.id
+            self.best_score = self.population.best.fitness
+
+            if self.checkpoint:
+                self.population.extra['simulation_time'] = self.simulation_time
+                self.population.save_checkpoint(self.checkpoint)
+
+        self.state = WorldState(len(self.population.pool))
+        if self.load_state and first_gen:
+            # FIXME: Does not evolve if load_state
+            self.cells = [CellV5(self.screen, name=brain.id, brain=load_brain(self.load_state), world=self.state)
+                          for brain in self.population.pool]
+        else:
+            self.cells = [CellV5(self.screen, name=brain.id, brain=brain, world=self.state)
+                          for brain in self.population.pool]
+
+    def generate_world_environment(self):
+        self.foods = []
+        for i in range(self.food_num):
+            self.foods.append(Food(self.screen, name=i, color=(255, 0, 255)))
+        self.world_info = self.foods
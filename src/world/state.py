@@ -0,0 +1,85 @@
+import numpy
+
+
+class WorldState:
+    """
+    The changing properties of all the cells of a world as a structure of arrays:
+    position, orientation, speed, health and fitness, one row per cell.
+    Cells are thin views on their row, so the whole population moves and ages in
+    one vectorized step instead of rebuilding two namedtuples per cell per tick.
+    """
+
+    FIELDS = ['x', 'y', 'orientation', 'speed', 'health', 'fitness']
+
+    def __init__(self, capacity=32, magic=0.04):
+        self.size = 0
+        self.magic = magic
+        for field in self.FIELDS:
+            setattr(self, field, numpy.zeros(max(capacity, 1)))
+
+    def __len__(self):
+        return self.size
+
+    def add(self, x, y, orientation, speed, health, fitness=0):
+        """
+        Appends a cell, growing the arrays if they are full
+        :return: row of the cell
+        """
+        if self.size == len(self.x):
+            for field in self.FIELDS:
+                array = getattr(self, field)
+                setattr(self, field, numpy.concatenate([array, numpy.zeros(len(array))]))
+
+        row = self.size
+        self.x[row] = x
+        self.y[row] = y
+        self.orientation[row] = orientation
+        self.speed[row] = speed
+        self.health[row] = health
+        self.fitness[row] = fitness
+        self.size += 1
+
+        return row
+
+    def move(self, rows, decisions):
+        """
+        Turns and moves the cells of the rows according to their decisions, like
+        Cell.apply_decisions did for one cell
+        :param rows: rows of the cells
+        :param decisions: one (rotation, acceleration) pair per row
+        """
+        rows = numpy.asarray(rows, dtype=numpy.intp)
+        decisions = numpy.asarray(decisions, dtype=float).reshape(len(rows), 2)
+
+        orientation = (self.orientation[rows] + decisions[:, 0] * 720 * self.magic) % 360
+        speed = numpy.maximum(self.speed[rows] + decisions[:, 1] * self.magic, 0)
+        angle = numpy.radians(orientation)
+
+        self.orientation[rows] = orientation
+        self.x[rows] += speed * numpy.cos(angle) * self.magic
+        self.y[rows] += speed * numpy.sin(angle) * self.magic
+
+    def update_properties(self, rows):
+        """
+        Ages the cells of the rows: one more fitness point, a bit less health
+        :param rows: rows of the cells
+        :return: boolean array, True for the rows whose cell died
+        """
+        rows = numpy.asarray(rows, dtype=numpy.intp)
+
+        health = numpy.minimum(numpy.round(self.health[rows] - 0.1, 2), 200)
+        dead = health <= 0
+        health[dead] = 0
+
+        self.health[rows] = health
+        self.fitness[rows] += 1
+
+        return dead
+
+    def step(self, rows, decisions):
+        """
+        Moves and then ages the cells of the rows
+        :return: boolean array, True for the rows whose cell died
+        """
+        self.move(rows, decisions)
+        return self.update_properties(rows)